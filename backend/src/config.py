@@ -11,10 +11,62 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 5 * 1024 * 1024  # 5MB
     ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".doc", ".txt"]
     UPLOAD_DIR: str = "uploads"
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    UPLOAD_SPOOL_THRESHOLD: int = 1024 * 1024  # larger uploads spool to disk
+
+    # PDF Extraction
+    PDF_EXTRACT_MODE: str = "serial"  # serial | parallel
+    PDF_EXTRACT_WORKERS: int = 4
+    PDF_MAX_PAGES: int = 50  # parallel extraction only; serial extraction reads every page
+    PDF_PARALLEL_MIN_PAGES: int = 4
+
+    # Layout hints from PDF fonts / DOCX styles for header detection
+    LAYOUT_HINTS_ENABLED: bool = True
+
+    # DOCX Extraction
+    # "stream" is faster and lighter but also extracts header, footer and table text,
+    # which the python-docx path (body paragraphs only) leaves out
+    DOCX_EXTRACTOR: str = "python-docx"  # python-docx | stream
+
+    # CPU-bound stages (parsing, embedding, DOCX generation)
+    # process isolates parsing from the event loop's GIL, but every worker loads its own
+    # spaCy and sentence-transformer models next to the API process's copy
+    CPU_EXECUTOR: str = "thread"  # thread | process
+    CPU_EXECUTOR_WORKERS: int = 2
 
     # AI MODEL
     SPACY_MODEL: str = "en_core_web_sm"
     SENTENCE_TRANSFORMER_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: str = "torch"  # torch | onnx | onnx-int8
+    EMBEDDING_ONNX_QUANTIZED_FILE: str = "onnx/model_qint8_avx512_vnni.onnx"
+    EMBEDDING_ONNX_QUANTIZATION: str = "avx2"
+    EMBEDDING_BACKEND_VERIFY: bool = False  # fall back to torch if the backend changes any fixture classification
+
+    # Embedding Cache
+    EMBEDDING_CACHE_SIZE: int = 50000
+    EMBEDDING_CACHE_PATH: str = ""  # e.g. "embedding_cache/embeddings.sqlite3"
+    EMBEDDING_CACHE_MMAP_SIZE: int = 256 * 1024 * 1024
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES: int = 200000  # least recently used rows pruned above this; 0 = unbounded
+
+    # Parse Result Cache
+    PARSE_CACHE_SIZE: int = 256
+    PARSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    PARSE_CACHE_DIR: str = ""  # e.g. "parse_cache"; empty disables the disk tier
+    PARSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Job Description Requirements Cache
+    JD_CACHE_SIZE: int = 512
+    JD_CACHE_TTL_SECONDS: int = 24 * 3600
+    JD_CACHE_SEMANTIC_THRESHOLD: float = 0.0  # e.g. 0.97; 0 disables the embedding tier
+
+    # LLM Response Cache (section tailoring)
+    LLM_CACHE_SIZE: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_DIR: str = ""  # e.g. "llm_cache"; empty disables the disk tier
+    LLM_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Skill Categorization
+    SKILL_CATEGORIZER_BACKEND: str = "memory"  # memory | chroma
 
     # OpenRouter AI
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
@@ -42,6 +94,13 @@ class Settings(BaseSettings):
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
     GROQ_MAX_TOKENS: int = 1500
 
+    # Concurrent LLM calls allowed per tailoring request
+    LLM_MAX_CONCURRENCY: int = 4
+
+    # Section tailoring: one JSON call for all sections, or one call per section
+    TAILOR_MODE: str = "combined"  # combined | per_section
+    TAILOR_COMBINED_MAX_TOKENS: int = 4000
+
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
 
@@ -1,13 +1,28 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from .config import settings
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import document_upload
 from .routers import resume_tailor
+from .services.executors import shutdown_executor, warm_up_executor
+from .services.latency_metrics import latency_tracker
+from .services.pdf_extractor import shutdown_pool as shutdown_pdf_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_executor()
+    yield
+    shutdown_executor()
+    shutdown_pdf_pool()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 
@@ -23,6 +38,17 @@ app.include_router(document_upload.router)
 app.include_router(resume_tailor.router)
 
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    latency_tracker.record(
+        f"{request.method} {route.path if route else request.url.path}",
+        time.perf_counter() - start_time)
+    return response
+
+
 @app.get('/')
 async def root():
     return {
@@ -40,6 +66,11 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics/latency")
+async def latency_metrics():
+    return latency_tracker.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host='0.0.0.0', port=8000)
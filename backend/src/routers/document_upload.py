@@ -1,12 +1,13 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
 import time
 import logging
-import tempfile
-import os
+from collections import Counter
 from pathlib import Path
 
 from ..models.models import ParsedResume, ProcessedResult, Experience, Project
 from ..services.document_parser import DocumentParser
+from ..services.executors import parse_upload, uses_process_pool, worker_stats
+from ..services.upload_stream import UploadTooLargeError, receive_upload
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -26,23 +27,17 @@ async def upload_and_process_document(file: UploadFile = File(...)):
                 detail=f"Unsupported file type. Allowed: {settings.ALLOWED_EXTENSIONS}"
             )
         
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
-        
-        if file_size > settings.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Max size: {settings.MAX_FILE_SIZE} bytes"
-            )
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
         try:
+            upload = await receive_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+        logger.info(
+            f"Received upload::{file.filename}::{upload.size} bytes::{upload.sha256[:12]}")
+
+        with upload:
             file_type = file_extension.lstrip('.')
-            parsed_data = processor.parse_document(tmp_file_path, file_type)
+            parsed_data = await parse_upload(processor, upload, file_type)
             
             resume_data = ParsedResume(
                 sections= {},
@@ -62,14 +57,32 @@ async def upload_and_process_document(file: UploadFile = File(...)):
                 processing_time=processing_time,
                 data=resume_data
             )
-            
-        finally:
-            os.unlink(tmp_file_path)
-            
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing document: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/health")
 async def text_health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@router.get("/stats")
+async def parser_stats():
+    stats = {
+        "header_detection_stages": dict(processor.analyzer.header_stage_counts),
+        "embedding_cache": processor.sentence_transformer.stats(),
+        "parse_cache": processor.parse_cache.stats()
+    }
+
+    # In process mode parsing runs in pool workers: stage counts include theirs, and the
+    # embedding counters they report are summed over workers (each keeps its own cache).
+    if uses_process_pool():
+        workers = worker_stats()
+        stats["header_detection_stages"] = dict(
+            processor.analyzer.header_stage_counts + Counter(workers["header_detection_stages"]))
+        stats["embedding_cache_workers"] = workers["embedding_cache"]
+
+    return stats
\ No newline at end of file
@@ -1,31 +1,33 @@
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
-import os, time, logging, tempfile
+import asyncio, time, logging
 from typing import Dict, Any, List
 from fastapi.responses import FileResponse
 from pathlib import Path
-from ..services.document_parser import DocumentParser
 from ..services.ai_content_extractor import ai_extractor
+from ..services.ai_jd_extractor import jd_analyzer
 from ..services.ai_resume_tailor import resume_tailor as ai_resume_tailor_service
+from ..services.llm_cache import llm_response_cache
 from ..config import settings
 from ..services.doc_generator import document_generator
-import shutil
+from ..services.executors import generate_tailored_resume, load_document
+from ..services.upload_stream import UploadTooLargeError, receive_upload
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
     prefix=f"{settings.API_V1_STR}/tailor", tags=["Resume Tailoring"])
 
-document_parser = DocumentParser()
-
 
 @router.post("/quick-tailor")
 async def quick_tailor_existing_resume(
     resume_data: Dict[str, Any],
-    job_description: str
+    job_description: str,
+    bypass_cache: bool = False
 ):
     try:
         tailored_result = await ai_resume_tailor_service.tailor_complete_resume(
             resume_data,
-            job_description
+            job_description,
+            bypass_cache=bypass_cache
         )
 
         return {
@@ -42,9 +44,9 @@ async def quick_tailor_existing_resume(
 async def tailor_resume_with_both_outputs(
     job_description: str = Form(...),
     resume_file: UploadFile = File(...),
+    bypass_cache: bool = Form(False),
 ):
-    temp_files = []
-
+    jd_task = None
     try:
         file_extension = Path(resume_file.filename).suffix.lower()
         if file_extension not in ['.docx']:
@@ -53,56 +55,65 @@ async def tailor_resume_with_both_outputs(
                 detail="Only DOCX files are supported for formatted output"
             )
 
-        content = await resume_file.read()
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-            tmp_file.write(content)
-            original_file_path = tmp_file.name
-            temp_files.append(original_file_path)
-
-        parsed_data = document_parser.parse_document(
-            original_file_path, 'docx')
-        extracted_resume_data = ai_extractor.extract_resume_sections(
-            parsed_data['raw_text'])
-        tailored_result = await ai_resume_tailor_service.tailor_complete_resume(
-            extracted_resume_data,
-            job_description,
-        )
-
-        tailored_sections = tailored_result["tailored_resume"]
-        logger.info(
-            f"Tailored sections received: {list(tailored_sections.keys())}")
-
-        sections_safe_to_modify = {
-            'professional_summary', 'skills', 'personal_info'}
+        # JD analysis only needs the form text, so it runs while the resume is received and extracted
+        jd_task = asyncio.create_task(
+            jd_analyzer.extract_job_requirements(job_description))
 
-        safe_tailored_data = {}
-        excluded_sections = []
+        try:
+            upload = await receive_upload(resume_file)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
-        for k, v in tailored_sections.items():
-            if k in sections_safe_to_modify:
-                safe_tailored_data[k] = v
-                logger.info(f"✓ Including safe section: {k}")
-            else:
-                excluded_sections.append(k)
-                logger.info(
-                    f"✗ EXCLUDING preserved section: {k} (will be preserved from original)")
-
-        logger.info(
-            f"Final safe tailored data keys: {list(safe_tailored_data.keys())}")
         logger.info(
-            f"Excluded sections (preserved from original): {excluded_sections}")
-
-        output_file_path = document_generator.generate_tailored_resume(
-            original_file_path,
-            extracted_resume_data,
-            safe_tailored_data
-        )
-
-        file_id = f"{int(time.time())}_{hash(resume_file.filename)}"
-        stored_path = Path(settings.UPLOAD_DIR) / f"tailored_{file_id}.docx"
-        shutil.copy2(output_file_path, stored_path)
+            f"Received upload::{resume_file.filename}::{upload.size} bytes::{upload.sha256[:12]}")
+
+        with upload:
+            document = await load_document(document_generator, upload)
+
+            extracted_resume_data, job_requirements = await asyncio.gather(
+                ai_extractor.extract_resume_sections(document.text), jd_task)
+            tailored_result = await ai_resume_tailor_service.tailor_complete_resume(
+                extracted_resume_data,
+                job_description,
+                job_requirements,
+                bypass_cache,
+            )
 
-        os.unlink(output_file_path)
+            tailored_sections = tailored_result["tailored_resume"]
+            logger.info(
+                f"Tailored sections received: {list(tailored_sections.keys())}")
+
+            sections_safe_to_modify = {
+                'professional_summary', 'skills', 'personal_info'}
+
+            safe_tailored_data = {}
+            excluded_sections = []
+
+            for k, v in tailored_sections.items():
+                if k in sections_safe_to_modify:
+                    safe_tailored_data[k] = v
+                    logger.info(f"✓ Including safe section: {k}")
+                else:
+                    excluded_sections.append(k)
+                    logger.info(
+                        f"✗ EXCLUDING preserved section: {k} (will be preserved from original)")
+
+            logger.info(
+                f"Final safe tailored data keys: {list(safe_tailored_data.keys())}")
+            logger.info(
+                f"Excluded sections (preserved from original): {excluded_sections}")
+
+            file_id = f"{int(time.time())}_{hash(resume_file.filename)}"
+            stored_path = Path(settings.UPLOAD_DIR) / f"tailored_{file_id}.docx"
+            stored_path.parent.mkdir(parents=True, exist_ok=True)
+
+            await generate_tailored_resume(
+                document_generator,
+                document,
+                extracted_resume_data,
+                safe_tailored_data,
+                str(stored_path)
+            )
 
 
         return {
@@ -117,22 +128,22 @@ async def tailor_resume_with_both_outputs(
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Resume tailoring failed: {str(e)}")
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except:
-                    pass
         raise HTTPException(status_code=500, detail=str(e))
-
     finally:
-        if os.path.exists(original_file_path):
-            try:
-                os.unlink(original_file_path)
-            except:
-                pass
+        if jd_task is not None and not jd_task.done():
+            jd_task.cancel()
+
+
+@router.get("/stats")
+async def tailoring_stats():
+    return {
+        "jd_cache": jd_analyzer.requirements_cache.stats(),
+        "llm_response_cache": llm_response_cache.stats()
+    }
 
 
 @router.get("/download/{file_id}")
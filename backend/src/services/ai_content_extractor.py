@@ -59,7 +59,7 @@ class AIExtractor:
             logger.error(f"Failed to initialize Hugging Face client: {str(e)}")
             raise e
 
-    def extract_resume_sections(self, resume_text: str) -> Dict[str, Any]:
+    async def extract_resume_sections(self, resume_text: str) -> Dict[str, Any]:
         prompt = """You are a professional resume parser. Extract the following sections from the resume text and return them in a clean JSON format:
 
         1. personal_info: Name, email, phone, address, LinkedIn, etc.
@@ -86,7 +86,7 @@ class AIExtractor:
                 HumanMessage(content=user_prompt)
             ]
 
-            response = self.client_groq.invoke(messages)
+            response = await self.client_groq.ainvoke(messages)
             content = response.content.strip()
             if content.startswith("```json"):
                 content = content[7:-3]
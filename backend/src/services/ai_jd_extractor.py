@@ -3,10 +3,13 @@ from langchain_core.messages import SystemMessage, HumanMessage
 from ..config import settings
 from langchain_openai import ChatOpenAI
 from typing import Dict, Any
+import asyncio
 from langchain_anthropic import ChatAnthropic
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 import json
 import logging
+from .embedding_backend import load_sentence_model
+from .jd_cache import JDRequirementsCache, normalize_jd_text
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +44,13 @@ class JDAnalyzer:
 
         self.client_huggingface = self._initialize_huggingface()
 
+        self.requirements_cache = JDRequirementsCache(
+            settings.JD_CACHE_SIZE,
+            settings.JD_CACHE_TTL_SECONDS,
+            settings.JD_CACHE_SEMANTIC_THRESHOLD,
+            sentence_model_loader=load_sentence_model
+        )
+
     def _initialize_huggingface(self):
         try:
             llm = HuggingFaceEndpoint(
@@ -55,6 +65,28 @@ class JDAnalyzer:
             raise e
 
     async def extract_job_requirements(self, jd_text: str) -> Dict[str, Any]:
+        normalized_text = normalize_jd_text(jd_text)
+        cache_key = self.requirements_cache.key(normalized_text)
+        cached = self.requirements_cache.get(cache_key)
+
+        vector = None
+        if cached is None and self.requirements_cache.semantic_enabled:
+            try:
+                vector = await asyncio.to_thread(self.requirements_cache.embed, normalized_text)
+                cached = self.requirements_cache.get_similar(vector)
+            except Exception as e:
+                logger.error(f"JD cache embedding failed::{str(e)}")
+
+        if cached is not None:
+            cached["description"] = jd_text
+            return cached
+
+        extracted_data = await self._extract_job_requirements(jd_text)
+        if "error" not in extracted_data:
+            self.requirements_cache.put(cache_key, extracted_data, vector)
+        return extracted_data
+
+    async def _extract_job_requirements(self, jd_text: str) -> Dict[str, Any]:
         prompt = """You are an expert job description analyzer. Extract the following information from the job description:
 
         1. role: The job title/role
@@ -90,7 +122,7 @@ class JDAnalyzer:
                 SystemMessage(content=prompt),
                 HumanMessage(content=user_prompt)
             ]
-            response = self.client_groq.invoke(messages)
+            response = await self.client_groq.ainvoke(messages)
             content = response.content.strip()
             if content.startswith("```json"):
                 content = content[7:-3]
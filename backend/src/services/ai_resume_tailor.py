@@ -1,65 +1,21 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from langchain_anthropic import ChatAnthropic
 from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 from ..config import settings
 from langchain_openai import ChatOpenAI
 from .ai_jd_extractor import jd_analyzer
+from .llm_cache import llm_response_cache, response_token_count
 from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 
 logger = logging.getLogger(__name__)
 
-
-class ResumeTailorService:
-    def __init__(self):
-
-        # self.client = ChatAnthropic(
-        #     api_key=settings.ANTHROPIC_API_KEY,
-        #     model=settings.ANTHROPIC_MODEL,
-        # )
-
-        self.client_groq = ChatGroq(
-            api_key=settings.GROQ_API_KEY,
-            model=settings.GROQ_MODEL,
-            max_tokens=settings.GROQ_MAX_TOKENS,
-            temperature=0.1
-        )
-        # self.client_openrouter = ChatOpenAI(
-        #     api_key=settings.OPENROUTER_API_KEY,
-        #     base_url=settings.OPENROUTER_BASE_URL,
-        #     model=settings.OPENROUTER_MODEL,
-        #     max_tokens=settings.OPENROUTER_MAX_TOKENS,
-        #     temperature=settings.OPENROUTER_TEMPERATURE,
-        #     model_kwargs={
-        #         "extra_headers": {
-        #             "HTTP-Referer": "https://trimfit-resume-tailor.com",
-        #             "X-Title": "TrimFit Resume Tailor",
-        #         }
-        #     }
-        # )
-
-        self.client = self._initialize_huggingface()
-
-    def _initialize_huggingface(self):
-        try:
-            llm = HuggingFaceEndpoint(
-                repo_id=settings.HUGGINGFACE_MODEL,
-                huggingfacehub_api_token=settings.HUGGINGFACE_API_KEY,
-                max_new_tokens=settings.HUGGINGFACE_MAX_TOKENS,
-                temperature=settings.HUGGINGFACE_TEMPERATURE
-            )
-            return ChatHuggingFace(llm=llm)
-
-        except Exception as e:
-            logger.error(f"Failed to initialize Hugging Face client: {str(e)}")
-            raise e
-
-    async def tailor_resume_section(self, section_name: str, section_content: str, job_requirements: Dict[str, Any]) -> Dict[str, Any]:
-
-        section_prompts = {
-            "professional_summary": """You are rewriting a professional summary to better align with a specific job opportunity. 
+SECTION_PROMPTS = {
+    "professional_summary": """You are rewriting a professional summary to better align with a specific job opportunity. 
 
 CRITICAL GUIDELINES:
 1. **Maintain Natural Flow**: Write in a conversational, professional tone - NOT a keyword list
@@ -84,7 +40,7 @@ TARGET ALIGNMENT:
 
 Write 2-3 sentences that sound natural and compelling.""",
 
-            "experience": """Enhance these work experiences to better align with the job requirements while maintaining authenticity.
+    "experience": """Enhance these work experiences to better align with the job requirements while maintaining authenticity.
 
 GUIDELINES:
 1. **Quantify Impact**: Add specific metrics, percentages, or numbers where possible
@@ -102,7 +58,7 @@ APPROACH:
 
 Transform the content to be more compelling while staying truthful.""",
 
-            "skills": """Reorganize and enhance this skills section to better match the job requirements.
+    "skills": """Reorganize and enhance this skills section to better match the job requirements.
             
 GUIDELINES:
 1. **Prioritize Relevance**: Put the most job-relevant skills first in each category
@@ -118,7 +74,7 @@ If input is a dictionary with categories like {{"programming_languages": [...],
 return the same dictionary structure with improved skill lists.
 Do NOT convert to a text description - maintain the original data structure.""",
 
-            "projects": """Enhance project descriptions to better showcase relevant technical skills and achievements.
+    "projects": """Enhance project descriptions to better showcase relevant technical skills and achievements.
 
 GUIDELINES:
 1. **Technical Alignment**: Emphasize projects using: {required_skills}
@@ -136,31 +92,135 @@ APPROACH:
 - Integrate relevant keywords naturally: {keywords}
 
 Transform descriptions to show technical depth and business value."""
-        }
+}
 
-        if section_name not in section_prompts:
-            return {"original": section_content, "tailored": section_content, "changes": []}
-
-        try:
-            formatted_prompt = section_prompts[section_name].format(
-                required_skills=",".join(
-                    job_requirements.get("required_skills", [])),
-                keywords=",".join(job_requirements.get("keywords", [])),
-                responsibilities=",".join(
-                    job_requirements.get("responsibilities", [])[:3]),
-                industry_domain=job_requirements.get("industry_domain", ""),
-                experience_level=job_requirements.get("experience_level", "")
-            )
-
-            messages = [
-                SystemMessage(content=f"""You are an expert resume writer who creates compelling, natural-sounding content. 
+SYSTEM_PREAMBLE = """You are an expert resume writer who creates compelling, natural-sounding content. 
 
 CORE PRINCIPLES:
 - **Human-First Writing**: Write as if you're a skilled professional telling their story, not a robot listing keywords
 - **Achievement-Focused**: Emphasize what the candidate has accomplished and delivered
 - **Natural Integration**: Weave technical skills into achievement contexts rather than listing them
 - **Authentic Voice**: Maintain the candidate's original tone and personality
-- **Strategic Relevance**: Align with job requirements through storytelling, not keyword stuffing
+- **Strategic Relevance**: Align with job requirements through storytelling, not keyword stuffing"""
+
+COMBINED_RESPONSE_FORMAT = """RESPONSE FORMAT - Return ONLY a valid JSON object with one entry per section listed above:
+{
+    "<section_name>": {
+        "tailored": "the improved content for that section",
+        "changes": ["list of key improvements made"]
+    }
+}
+
+CRITICAL: Your response must be ONLY the JSON object above. No additional text, no markdown, no explanations.
+Keep each section's original data type: a dictionary of skill categories stays a dictionary, lists stay lists.
+The 'tailored' content should sound like it was written by a human professional, not an AI."""
+
+
+class ResumeTailorService:
+    def __init__(self):
+
+        # self.client = ChatAnthropic(
+        #     api_key=settings.ANTHROPIC_API_KEY,
+        #     model=settings.ANTHROPIC_MODEL,
+        # )
+
+        self.client_groq = ChatGroq(
+            api_key=settings.GROQ_API_KEY,
+            model=settings.GROQ_MODEL,
+            max_tokens=settings.GROQ_MAX_TOKENS,
+            temperature=0.1
+        )
+        self.client_groq_combined = ChatGroq(
+            api_key=settings.GROQ_API_KEY,
+            model=settings.GROQ_MODEL,
+            max_tokens=settings.TAILOR_COMBINED_MAX_TOKENS,
+            temperature=0.1
+        )
+        # self.client_openrouter = ChatOpenAI(
+        #     api_key=settings.OPENROUTER_API_KEY,
+        #     base_url=settings.OPENROUTER_BASE_URL,
+        #     model=settings.OPENROUTER_MODEL,
+        #     max_tokens=settings.OPENROUTER_MAX_TOKENS,
+        #     temperature=settings.OPENROUTER_TEMPERATURE,
+        #     model_kwargs={
+        #         "extra_headers": {
+        #             "HTTP-Referer": "https://trimfit-resume-tailor.com",
+        #             "X-Title": "TrimFit Resume Tailor",
+        #         }
+        #     }
+        # )
+
+        self.client = self._initialize_huggingface()
+
+    def _initialize_huggingface(self):
+        try:
+            llm = HuggingFaceEndpoint(
+                repo_id=settings.HUGGINGFACE_MODEL,
+                huggingfacehub_api_token=settings.HUGGINGFACE_API_KEY,
+                max_new_tokens=settings.HUGGINGFACE_MAX_TOKENS,
+                temperature=settings.HUGGINGFACE_TEMPERATURE
+            )
+            return ChatHuggingFace(llm=llm)
+
+        except Exception as e:
+            logger.error(f"Failed to initialize Hugging Face client: {str(e)}")
+            raise e
+
+    def _format_section_prompt(self, section_name: str, job_requirements: Dict[str, Any]) -> str:
+        return SECTION_PROMPTS[section_name].format(
+            required_skills=",".join(
+                job_requirements.get("required_skills", [])),
+            keywords=",".join(job_requirements.get("keywords", [])),
+            responsibilities=",".join(
+                job_requirements.get("responsibilities", [])[:3]),
+            industry_domain=job_requirements.get("industry_domain", ""),
+            experience_level=job_requirements.get("experience_level", "")
+        )
+
+    def _extract_json_text(self, content: str) -> Optional[str]:
+        content = content.strip()
+
+        if content.startswith("```json"):
+            content = content[7:-3].strip()
+        elif content.startswith("```"):
+            start_idx = content.find('{')
+            end_idx = content.rfind('}') + 1
+            if start_idx != -1 and end_idx != 0:
+                content = content[start_idx:end_idx]
+
+        content = content.strip()
+        if not content.startswith('{'):
+            start_idx = content.find('{')
+            end_idx = content.rfind('}') + 1
+            if start_idx == -1 or end_idx == 0:
+                return None
+            content = content[start_idx:end_idx]
+
+        return content
+
+    async def _invoke_cached(self, client, messages: List[Any], bypass_cache: bool) -> Tuple[str, str, Optional[Tuple[float, int]]]:
+        cache_key = llm_response_cache.key(client, messages)
+        raw_content = llm_response_cache.get(cache_key, bypass=bypass_cache)
+        if raw_content is not None:
+            return cache_key, raw_content, None
+
+        started = time.perf_counter()
+        response = await client.ainvoke(messages)
+        latency_seconds = time.perf_counter() - started
+        return cache_key, response.content, (latency_seconds, response_token_count(response))
+
+    async def tailor_resume_section(self, section_name: str, section_content: str, job_requirements: Dict[str, Any],
+                                    bypass_cache: bool = False) -> Dict[str, Any]:
+
+        if section_name not in SECTION_PROMPTS:
+            return {"original": section_content, "tailored": section_content, "changes": []}
+
+        try:
+            formatted_prompt = self._format_section_prompt(
+                section_name, job_requirements)
+
+            messages = [
+                SystemMessage(content=f"""{SYSTEM_PREAMBLE}
 
 {formatted_prompt}
                 
@@ -177,33 +237,22 @@ The 'tailored' content should sound like it was written by a human professional,
                     content=f"Original content: {json.dumps(section_content)}")
             ]
 
-            response = self.client_groq.invoke(messages)
-            content = response.content.strip()
-
-            if content.startswith("```json"):
-                content = content[7:-3].strip()
-            elif content.startswith("```"):
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                if start_idx != -1 and end_idx != 0:
-                    content = content[start_idx:end_idx]
-
-            content = content.strip()
-            if not content.startswith('{'):
-                start_idx = content.find('{')
-                end_idx = content.rfind('}') + 1
-                if start_idx != -1 and end_idx != 0:
-                    content = content[start_idx:end_idx]
-                else:
-                    logger.error(f"No valid JSON found in response: {content}")
-                    return {
-                        "original": section_content,
-                        "tailored": section_content,
-                        "changes": ["Error: No valid JSON found in response"]
-                    }
+            cache_key, raw_content, fresh = await self._invoke_cached(
+                self.client_groq, messages, bypass_cache)
+
+            content = self._extract_json_text(raw_content)
+            if content is None:
+                logger.error(f"No valid JSON found in response: {raw_content}")
+                return {
+                    "original": section_content,
+                    "tailored": section_content,
+                    "changes": ["Error: No valid JSON found in response"]
+                }
 
             try:
                 result = json.loads(content)
+                if fresh is not None:
+                    llm_response_cache.put(cache_key, raw_content, *fresh)
                 return result
             except json.JSONDecodeError as json_error:
                 logger.error(
@@ -223,8 +272,82 @@ The 'tailored' content should sound like it was written by a human professional,
                 "changes": [f"Processing error: {str(e)}"]
             }
 
-    async def tailor_complete_resume(self, resume_data: Dict[str, Any], job_description: str) -> Dict[str, Any]:
-        job_requirements = await jd_analyzer.extract_job_requirements(job_description)
+    def _validate_combined_section(self, section_name: str, section_content: Any, result: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(result, dict) or not result.get("tailored"):
+            return None
+
+        tailored = result["tailored"]
+        if section_name == "skills" and isinstance(section_content, dict):
+            if isinstance(tailored, str):
+                try:
+                    tailored = json.loads(tailored)
+                except json.JSONDecodeError:
+                    return None
+            if not isinstance(tailored, dict):
+                return None
+        elif section_name == "professional_summary" and not isinstance(tailored, str):
+            return None
+
+        changes = result.get("changes")
+        return {
+            "original": section_content,
+            "tailored": tailored,
+            "changes": changes if isinstance(changes, list) else []
+        }
+
+    async def tailor_sections_combined(self, sections: Dict[str, Any], job_requirements: Dict[str, Any],
+                                       bypass_cache: bool = False) -> Dict[str, Dict[str, Any]]:
+        sections = {name: content for name, content in sections.items()
+                    if name in SECTION_PROMPTS}
+        if not sections:
+            return {}
+
+        section_instructions = "\n\n".join(
+            f"### SECTION: {name}\n{self._format_section_prompt(name, job_requirements)}"
+            for name in sections)
+
+        messages = [
+            SystemMessage(content=f"""{SYSTEM_PREAMBLE}
+
+Tailor each of the following resume sections. Apply every section's own guidelines.
+
+{section_instructions}
+
+{COMBINED_RESPONSE_FORMAT}"""),
+            HumanMessage(
+                content=f"Original sections: {json.dumps(sections)}")
+        ]
+
+        try:
+            cache_key, raw_content, fresh = await self._invoke_cached(
+                self.client_groq_combined, messages, bypass_cache)
+            content = self._extract_json_text(raw_content)
+            parsed = json.loads(content) if content is not None else None
+        except Exception as e:
+            logger.error(f"Combined tailoring failed: {str(e)}")
+            return {}
+
+        if not isinstance(parsed, dict):
+            logger.error("Combined tailoring returned no JSON object")
+            return {}
+
+        results = {}
+        for name, content in sections.items():
+            validated = self._validate_combined_section(
+                name, content, parsed.get(name))
+            if validated is not None:
+                results[name] = validated
+
+        if fresh is not None and len(results) == len(sections):
+            llm_response_cache.put(cache_key, raw_content, *fresh)
+
+        return results
+
+    async def tailor_complete_resume(self, resume_data: Dict[str, Any], job_description: str,
+                                     job_requirements: Optional[Dict[str, Any]] = None,
+                                     bypass_cache: bool = False) -> Dict[str, Any]:
+        if job_requirements is None:
+            job_requirements = await jd_analyzer.extract_job_requirements(job_description)
 
         tailored_sections = {}
         changes_made = {}
@@ -241,22 +364,50 @@ The 'tailored' content should sound like it was written by a human professional,
             'projects', 'experience'
         }
 
-        if resume_data.get("professional_summary") and "professional_summary" in sections_to_tailor:
-            tailored_summary = await self.tailor_resume_section(
-                "professional_summary",
-                resume_data["professional_summary"],
-                job_requirements
+        semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+        async def tailor_limited(section_name: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.tailor_resume_section(
+                    section_name,
+                    resume_data[section_name],
+                    job_requirements,
+                    bypass_cache
+                )
+
+        tailor_names = [section for section in ("professional_summary", "skills")
+                        if section in sections_to_tailor and resume_data.get(section)]
+        suggest_names = [section for section in sections_to_suggest
+                         if resume_data.get(section)]
+
+        section_names = tailor_names + suggest_names
+        results: Dict[str, Dict[str, Any]] = {}
+        if settings.TAILOR_MODE == "combined" and len(section_names) > 1:
+            results = await self.tailor_sections_combined(
+                {section: resume_data[section] for section in section_names},
+                job_requirements,
+                bypass_cache
             )
+
+        fallback_names = [section for section in section_names if section not in results]
+        if results and fallback_names:
+            logger.info(f"Combined tailoring fallback::{fallback_names}")
+
+        fallback_results = await asyncio.gather(
+            *(tailor_limited(section) for section in fallback_names))
+        results.update(zip(fallback_names, fallback_results))
+
+        tailor_results = {section: results[section] for section in tailor_names}
+        suggestion_results = {section: results[section] for section in suggest_names}
+
+        if "professional_summary" in tailor_results:
+            tailored_summary = tailor_results["professional_summary"]
             tailored_sections["professional_summary"] = tailored_summary["tailored"]
             changes_made["professional_summary"] = tailored_summary.get(
                 "changes", [])
 
-        if resume_data.get("skills") and "skills" in sections_to_tailor:
-            result = await self.tailor_resume_section(
-                "skills",
-                resume_data["skills"],
-                job_requirements
-            )
+        if "skills" in tailor_results:
+            result = tailor_results["skills"]
             tailored_skills = result["tailored"]
             if isinstance(tailored_skills, str):
                 try:
@@ -273,17 +424,11 @@ The 'tailored' content should sound like it was written by a human professional,
                 tailored_sections[section] = resume_data[section]
 
         text_suggestions = {}
-        for section_name in sections_to_suggest:
-            if resume_data.get(section_name):
-                suggestion_result = await self.tailor_resume_section(
-                    section_name,
-                    resume_data[section_name],
-                    job_requirements
-                )
-                text_suggestions[section_name] = {
-                    "suggested_improvements": suggestion_result["tailored"],
-                    "recommended_changes": suggestion_result.get("changes", [])
-                }
+        for section_name, suggestion_result in suggestion_results.items():
+            text_suggestions[section_name] = {
+                "suggested_improvements": suggestion_result["tailored"],
+                "recommended_changes": suggestion_result.get("changes", [])
+            }
 
         if "personal_info" in resume_data:
             tailored_sections["personal_info"] = resume_data["personal_info"]
@@ -1,59 +1,100 @@
-from typing import List
+import re
+import numpy as np
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from .header_classifier import HeaderClassifier, normalize_header
+from .layout_features import BODY, HEADING
+from .line_embedding_index import LineEmbeddingIndex
+from .section_headers import LOOSE_HEADER_CONFIDENCE, LOOSE_SECTION_HEADERS, SECTION_HEADERS
+
+# Bullets, contact details, dates/numbers, sentence endings and comma-separated lists
+NON_HEADER_PATTERN = re.compile(
+    r'^[•●▪▫◦‣⁃\-\*\+]|[@|;]|https?:|www\.|[.!?]$|\d{3,}|\d[/.:\-]\d|(?:[^,]*,){3}')
 
 
 class BaseAnalyzer:
 
-    def __init__(self, sentence_model: SentenceTransformer):
+    def __init__(self, sentence_model: SentenceTransformer, header_classifier: Optional[HeaderClassifier] = None):
         self.sentence_model = sentence_model
-        self.embeddings_cache = {}
+        self.header_classifier = header_classifier or HeaderClassifier(
+            sentence_model)
+        for section_type, headers in SECTION_HEADERS.items():
+            self.header_classifier.add_lexicon(section_type, headers)
 
-    def _get_section_embeddings(self, section_type: str, headers: List[str]):
-        if section_type not in self.embeddings_cache:
-            self.embeddings_cache[section_type] = self.sentence_model.encode(
-                headers)
-        return self.embeddings_cache[section_type]
+        self.header_stage_counts = Counter()
 
-    def _is_section_header(self, line: str, section_type: str, headers: List[str], threshold: float = 0.6) -> bool:
-        if not line or len(line.split()) > 4 or len(line) > 30:
-            return False
+    def _is_structural_non_header(self, line: str) -> bool:
+        if not line or len(line.split()) > 6 or len(line) > 40:
+            return True
+        return NON_HEADER_PATTERN.search(line) is not None
+
+    def _lexicon_match(self, line: str, layout_hint: Optional[str] = None) -> Tuple[Set[str], float]:
+        key = normalize_header(line)
+        labels = self.header_classifier.lexicon.get(key)
+        if labels is None:
+            return set(), 0.0
+
+        stripped = line.strip()
+        styled_as_header = layout_hint == HEADING or stripped.isupper() or stripped.endswith(':')
+        if key in LOOSE_SECTION_HEADERS and not styled_as_header:
+            return labels, LOOSE_HEADER_CONFIDENCE
+        return labels, 1.0
 
-        line_embedding = self.sentence_model.encode([line])
-        section_embeddings = self._get_section_embeddings(
-            section_type, headers)
-        similarities = cosine_similarity(line_embedding, section_embeddings)
+    def _resolve_header_stage(self, line: str,
+                              layout_hint: Optional[str] = None) -> Tuple[str, Optional[np.ndarray]]:
+        labels, confidence = self._lexicon_match(line, layout_hint)
+        if labels:
+            return "dictionary", self.header_classifier.label_row(labels, confidence)
 
-        return similarities.max() > threshold
+        if layout_hint == BODY:
+            return "layout", self.header_classifier.label_row(())
 
-    def _extract_general_section_content(self, lines: List[str], start_idx: int,
-                                         section_checkers: List[callable]) -> str:
-        content_lines = []
-        i = start_idx + 1
+        if layout_hint != HEADING and self._is_structural_non_header(line):
+            return "structural", self.header_classifier.label_row(())
 
-        major_section_headers = [
-            'SKILLS', 'WORK EXPERIENCE', 'EXPERIENCE', 'PROJECTS', 'EDUCATION',
-            'PROFESSIONAL SUMMARY', 'SUMMARY', 'CERTIFICATIONS', 'AWARDS'
-        ]
+        return "model", None
 
-        while i < len(lines):
-            line = lines[i].strip()
+    def _build_line_index(self, lines: Iterable[str],
+                          layout_hints: Optional[Dict[str, str]] = None) -> LineEmbeddingIndex:
+        layout_hints = layout_hints or {}
+        stage_counts = Counter()
+        model_lines = []
+        for line in dict.fromkeys(line.strip() for line in lines if line.strip()):
+            stage, _ = self._resolve_header_stage(line, layout_hints.get(line))
+            stage_counts[stage] += 1
+            if stage == "model":
+                model_lines.append(line)
 
-            if any(checker(line) for checker in section_checkers):
-                break
+        line_index = LineEmbeddingIndex(self.sentence_model, model_lines)
+        line_index.stage_counts = stage_counts
+        line_index.layout_hints = layout_hints
+        self.header_stage_counts.update(stage_counts)
+        return line_index
 
-            if line.upper() in major_section_headers:
-                break
-            if not line:
-                empty_count = 0
-                j = i
-                while j < len(lines) and not lines[j].strip():
-                    empty_count += 1
-                    j += 1
-                if empty_count > 2:
-                    break
+    def _header_scores(self, line: str, line_index: Optional[LineEmbeddingIndex] = None) -> np.ndarray:
+        line = line.strip()
+        layout_hint = line_index.layout_hints.get(line) if line_index is not None else None
+        _, scores = self._resolve_header_stage(line, layout_hint)
+        if scores is not None:
+            return scores
 
-            content_lines.append(line)
-            i += 1
+        if line_index is not None:
+            return line_index.get_scores(line, self.header_classifier)
+        return self.header_classifier.score(self.sentence_model.encode([line]))[0]
+
+    def _section_similarity(self, line: str, section_type: str,
+                            line_index: Optional[LineEmbeddingIndex] = None) -> float:
+        scores = self._header_scores(line, line_index)
+        return float(scores[self.header_classifier.label_positions[section_type]])
+
+    def _passes_header_gate(self, line: str) -> bool:
+        return bool(line) and len(line.split()) <= 4 and len(line) <= 30
+
+    def _is_section_header(self, line: str, section_type: str, headers: List[str], threshold: float = 0.6,
+                           line_index: Optional[LineEmbeddingIndex] = None) -> bool:
+        if not self._passes_header_gate(line):
+            return False
 
-        return '\n'.join(content_lines).strip()
+        self.header_classifier.register(section_type, headers)
+        return self._section_similarity(line, section_type, line_index) > threshold
@@ -0,0 +1,214 @@
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, stored_at = entry
+            if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class DiskCache:
+    """LRU by file atime (touched on hit); the TTL uses mtime. The directory is rescanned before
+    evicting because other worker processes may write to it too."""
+
+    def __init__(self, directory: str, ttl_seconds: Optional[float] = None, max_bytes: int = 0):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._total_bytes = sum(size for _, _, size in self._scan())
+
+    def _path(self, key: Hashable) -> str:
+        digest = hashlib.sha256(str(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_atime, entry.path, stat.st_size))
+        return entries
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+            self._total_bytes -= size
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        path = self._path(key)
+        with self._lock:
+            try:
+                stored_at = os.path.getmtime(path)
+                if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+                    self._remove(path)
+                    self.expirations += 1
+                    self.misses += 1
+                    return default
+
+                with open(path, "r", encoding="utf-8") as cache_file:
+                    value = json.load(cache_file)
+                os.utime(path, (time.time(), stored_at))
+            except (OSError, ValueError):
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        path = self._path(key)
+        payload = json.dumps(value).encode('utf-8')
+        if self.max_bytes and len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._remove(path)
+            # Unique across processes sharing the directory, unlike a thread ident
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(payload)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(payload)
+
+            if self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = self._scan()
+        self._total_bytes = sum(size for _, _, size in entries)
+        for _, path, _ in sorted(entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            for _, path, _ in self._scan():
+                self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class TieredCache:
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return copy.deepcopy(value)
+
+        if self.disk is not None:
+            value = self.disk.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.put(key, value)
+                return copy.deepcopy(value)
+
+        return default
+
+    def put(self, key: Hashable, value: Any):
+        value = copy.deepcopy(value)
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
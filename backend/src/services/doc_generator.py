@@ -3,26 +3,25 @@ import re
 import tempfile
 from docx import Document
 from docx.oxml import OxmlElement
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.oxml.ns import qn
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, BinaryIO, Optional, Set, Union
 from collections import defaultdict
 
+from ..config import settings
+from .docx_extractor import text_part_names
+from .section_headers import SECTION_HEADERS
+
 logger = logging.getLogger(__name__)
 
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
 
 class DocGenerator:
     def __init__(self):
-        self.section_headers = {
-            'professional_summary': ['summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me', 'professional profile', 'career summary'],
-            'experience': ['experience', 'work experience', 'employment', 'professional experience', 'work history', 'career history', 'employment history', 'work', 'career experience'],
-            'skills': ['skills', 'technical skills', 'core competencies', 'competencies', 'expertise', 'technical expertise', 'core skills', 'key skills', 'areas of expertise'],
-            'education': ['education', 'academic background', 'qualifications', 'academic qualifications', 'educational background', 'academic history'],
-            'projects': ['projects', 'key projects', 'project experience', 'professional projects', 'notable projects', 'project work', 'portfolio'],
-            'certifications': ['certifications', 'certificates', 'professional certifications', 'credentials', 'professional credentials'],
-            'achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'recognition', 'notable achievements']
-        }
+        self.section_headers = SECTION_HEADERS
 
         self.target_sections_for_update = {
             'professional_summary', 'skills'}
@@ -42,13 +41,18 @@ class DocGenerator:
             'website': r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&\/=]*)'
         }
 
+    def load_document(self, source: Union[str, BinaryIO]) -> "LoadedDocument":
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return LoadedDocument(Document(source), self)
+
     def generate_tailored_resume(
         self,
-        original_file_path: str,
+        original_file: Union[str, BinaryIO, "LoadedDocument"],
         extracted_data: Dict[str, Any],
         tailored_data: Dict[str, Any],
-        output_path: Optional[str] = None
-    ) -> str:
+        output_path: Optional[Union[str, BinaryIO]] = None
+    ) -> Union[str, BinaryIO]:
 
         try:
             logger.info("Starting tailored resume generation")
@@ -57,14 +61,11 @@ class DocGenerator:
             logger.info(
                 f"Critical sections never to modify: {list(self.critical_sections_never_modify)}")
 
-            doc = Document(original_file_path)
-
-            personal_info = self._extract_personal_info(doc)
-
-            doc_structure = self._analyze_document_structure(doc)
-
-            section_map = self._map_document_sections_enhanced(
-                doc, doc_structure)
+            loaded = (original_file if isinstance(original_file, LoadedDocument)
+                      else self.load_document(original_file))
+            doc = loaded.doc
+            personal_info = loaded.personal_info
+            section_map = loaded.section_map
 
             self._verify_no_critical_sections_in_tailored_data(tailored_data)
 
@@ -77,13 +78,13 @@ class DocGenerator:
                     logger.error(
                         f"Creating verification snapshot for CRITICAL section: {section_name}")
                     critical_section_snapshots[section_name] = self._create_critical_section_snapshot(
-                        doc, section_info)
+                        loaded.paragraphs, section_info)
 
             self._update_document_sections_with_complete_protection(
                 doc, section_map, extracted_data, filtered_tailored_data, personal_info)
 
             verification_result = self._verify_critical_sections_unchanged(
-                doc, section_map, critical_section_snapshots)
+                critical_section_snapshots)
 
             if not verification_result['all_verified']:
                 logger.error("Critical sections verification failed")
@@ -128,38 +129,61 @@ class DocGenerator:
 
         return filtered_data
 
-    def _create_critical_section_snapshot(self, doc: Document, section_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _create_critical_section_snapshot(self, paragraphs: List[Paragraph], section_info: Dict[str, Any]) -> Dict[str, Any]:
         snapshot = {
             'header_text': '',
             'content_texts': [],
             'paragraph_count': 0,
-            'total_characters': 0
+            'total_characters': 0,
+            'elements': [],
+            'next_element': None
         }
 
         try:
             header_idx = section_info['header_idx']
-            if header_idx < len(doc.paragraphs):
-                snapshot['header_text'] = doc.paragraphs[header_idx].text
-
-            start_idx = section_info['start_idx']
-            end_idx = section_info['end_idx']
+            end_idx = min(section_info['end_idx'], len(paragraphs) - 1)
+            if header_idx >= len(paragraphs):
+                return snapshot
 
-            for idx in range(start_idx, min(end_idx + 1, len(doc.paragraphs))):
-                para_text = doc.paragraphs[idx].text
-                snapshot['content_texts'].append(para_text)
-                snapshot['total_characters'] += len(para_text)
+            section_paragraphs = paragraphs[header_idx:end_idx + 1]
+            snapshot['elements'] = [paragraph._p for paragraph in section_paragraphs]
+            if end_idx + 1 < len(paragraphs):
+                snapshot['next_element'] = paragraphs[end_idx + 1]._p
 
-            snapshot['paragraph_count'] = len(snapshot['content_texts'])
+            self._fill_snapshot_texts(snapshot, section_paragraphs)
 
         except Exception as e:
             logger.error(f"Error creating critical section snapshot: {e}")
 
         return snapshot
 
+    def _fill_snapshot_texts(self, snapshot: Dict[str, Any], section_paragraphs: List[Paragraph]):
+        snapshot['header_text'] = section_paragraphs[0].text if section_paragraphs else ''
+        snapshot['content_texts'] = [paragraph.text for paragraph in section_paragraphs[1:]]
+        snapshot['paragraph_count'] = len(snapshot['content_texts'])
+        snapshot['total_characters'] = sum(len(text) for text in snapshot['content_texts'])
+
+    def _current_section_snapshot(self, original_snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        elements = original_snapshot['elements']
+        if not elements or elements[0].getparent() is None:
+            return None
+
+        # Walk the body from the original header element rather than re-mapping sections:
+        # updates to other sections may shift paragraph indices but never move these elements.
+        current_elements = []
+        element = elements[0]
+        while element is not None and element is not original_snapshot['next_element']:
+            if element.tag == qn('w:p'):
+                current_elements.append(element)
+            element = element.getnext()
+
+        snapshot = {'elements': current_elements}
+        self._fill_snapshot_texts(
+            snapshot, [Paragraph(element, None) for element in current_elements])
+        return snapshot
+
     def _verify_critical_sections_unchanged(
         self,
-        doc: Document,
-        section_map: Dict[str, Dict[str, Any]],
         original_snapshots: Dict[str, Dict[str, Any]]
     ) -> Dict[str, Any]:
         verification_result = {
@@ -167,10 +191,6 @@ class DocGenerator:
             'verification_details': {}
         }
 
-        current_doc_structure = self._analyze_document_structure(doc)
-        current_section_map = self._map_document_sections_enhanced(
-            doc, current_doc_structure)
-
         for section_name, original_snapshot in original_snapshots.items():
             verification_result['verification_details'][section_name] = {
                 'verified': False,
@@ -178,20 +198,20 @@ class DocGenerator:
                 'details': {}
             }
 
-            if section_name not in current_section_map:
+            current_snapshot = self._current_section_snapshot(original_snapshot)
+            if current_snapshot is None:
                 verification_result['all_verified'] = False
                 verification_result['verification_details'][section_name]['reason'] = 'Section not found in current document'
                 continue
 
-            current_section_info = current_section_map[section_name]
-            current_snapshot = self._create_critical_section_snapshot(
-                doc, current_section_info)
-
             verification_details = {
                 'header_match': original_snapshot['header_text'] == current_snapshot['header_text'],
                 'paragraph_count_match': original_snapshot['paragraph_count'] == current_snapshot['paragraph_count'],
                 'character_count_match': original_snapshot['total_characters'] == current_snapshot['total_characters'],
-                'content_match': original_snapshot['content_texts'] == current_snapshot['content_texts']
+                'content_match': original_snapshot['content_texts'] == current_snapshot['content_texts'],
+                'elements_match': (len(original_snapshot['elements']) == len(current_snapshot['elements'])
+                                   and all(original is current for original, current in
+                                           zip(original_snapshot['elements'], current_snapshot['elements'])))
             }
 
             all_match = all(verification_details.values())
@@ -283,7 +303,8 @@ class DocGenerator:
 
         return dict(personal_info)
 
-    def _analyze_document_structure(self, doc: Document) -> Dict[str, Any]:
+    def _analyze_document_structure(self, doc: Document,
+                                    paragraphs: Optional[List[Paragraph]] = None) -> Dict[str, Any]:
         structure = {
             'styles': {},
             'paragraph_formats': [],
@@ -294,7 +315,7 @@ class DocGenerator:
             'lists': defaultdict(list)
         }
 
-        for idx, paragraph in enumerate(doc.paragraphs):
+        for idx, paragraph in enumerate(paragraphs if paragraphs is not None else doc.paragraphs):
             para_info = {
                 'idx': idx,
                 'style': paragraph.style.name if paragraph.style else None,
@@ -356,12 +377,15 @@ class DocGenerator:
 
         return hyperlinks
 
-    def _map_document_sections_enhanced(self, doc: Document, doc_structure: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def _map_document_sections_enhanced(self, doc: Document, doc_structure: Dict[str, Any],
+                                        paragraphs: Optional[List[Paragraph]] = None) -> Dict[str, Dict[str, Any]]:
         section_map = {}
         current_section = None
         section_start_idx = 0
+        if paragraphs is None:
+            paragraphs = doc.paragraphs
 
-        for idx, paragraph in enumerate(doc.paragraphs):
+        for idx, paragraph in enumerate(paragraphs):
             text = paragraph.text.strip()
             if not text:
                 continue
@@ -374,7 +398,7 @@ class DocGenerator:
                         'header_idx': section_start_idx,
                         'start_idx': section_start_idx + 1,
                         'end_idx': idx - 1,
-                        'header_paragraph': doc.paragraphs[section_start_idx],
+                        'header_paragraph': paragraphs[section_start_idx],
                         'format_info': doc_structure['paragraph_formats'][section_start_idx + 1:idx] if section_start_idx + 1 < idx else []
                     }
                     section_map[current_section] = section_info
@@ -382,13 +406,13 @@ class DocGenerator:
                 current_section = section_type
                 section_start_idx = idx
 
-        if current_section and section_start_idx < len(doc.paragraphs):
+        if current_section and section_start_idx < len(paragraphs):
             section_info = {
                 'header_idx': section_start_idx,
                 'start_idx': section_start_idx + 1,
-                'end_idx': len(doc.paragraphs) - 1,
-                'header_paragraph': doc.paragraphs[section_start_idx],
-                'format_info': doc_structure['paragraph_formats'][section_start_idx + 1:] if section_start_idx + 1 < len(doc.paragraphs) else []
+                'end_idx': len(paragraphs) - 1,
+                'header_paragraph': paragraphs[section_start_idx],
+                'format_info': doc_structure['paragraph_formats'][section_start_idx + 1:] if section_start_idx + 1 < len(paragraphs) else []
             }
             section_map[current_section] = section_info
 
@@ -903,4 +927,51 @@ class DocGenerator:
         return current_idx
 
 
+class LoadedDocument:
+    """A DOCX parsed once per request, with its paragraph index and section map."""
+
+    def __init__(self, doc: Document, generator: DocGenerator):
+        self.doc = doc
+        self.paragraphs = doc.paragraphs
+        self.structure = generator._analyze_document_structure(
+            doc, self.paragraphs)
+        self.section_map = generator._map_document_sections_enhanced(
+            doc, self.structure, self.paragraphs)
+        self.personal_info = generator._extract_personal_info(doc)
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            if settings.DOCX_EXTRACTOR == "stream":
+                self._text = '\n'.join(self._iter_paragraph_texts())
+            else:
+                self._text = '\n'.join(paragraph.text.strip() for paragraph in self.paragraphs
+                                       if paragraph.text.strip())
+        return self._text
+
+    def _iter_paragraph_texts(self):
+        document_part = self.doc.part
+        parts = {str(document_part.partname).lstrip('/'): document_part}
+        headers, footers = [], []
+        for relationship in document_part.rels.values():
+            if relationship.is_external or relationship.reltype not in (RT.HEADER, RT.FOOTER):
+                continue
+            name = str(relationship.target_part.partname).lstrip('/')
+            parts[name] = relationship.target_part
+            (headers if relationship.reltype == RT.HEADER else footers).append(name)
+
+        for part_name in text_part_names(str(document_part.partname).lstrip('/'),
+                                         list(dict.fromkeys(headers)), list(dict.fromkeys(footers))):
+            element = parts[part_name].element
+            fallback = {paragraph for fallback_element in element.iter(MC_FALLBACK)
+                        for paragraph in fallback_element.iter(qn('w:p'))}
+            for paragraph in element.iter(qn('w:p')):
+                if paragraph in fallback:
+                    continue
+                text = paragraph.text.strip()
+                if text:
+                    yield text
+
+
 document_generator = DocGenerator()
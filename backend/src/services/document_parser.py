@@ -1,20 +1,27 @@
 import spacy
+import hashlib
 import logging
 from docx import Document
-from typing import Dict, Any
-
-from pdfminer.high_level import extract_text
-from pdfminer.layout import LAParams
-from sentence_transformers import SentenceTransformer
+from typing import Any, BinaryIO, Collection, Dict, Optional, Tuple, Union
+
+from .embedding_backend import load_verified_sentence_model
+from .cache import DiskCache, LRUCache, TieredCache
+from .embedding_cache import CachedSentenceEncoder
+from .docx_extractor import extract_docx_text, extract_docx_text_with_layout
+from .layout_features import LineLayout, classify_layout
+from .pdf_extractor import extract_pdf_text, extract_pdf_text_with_layout
+from .text_extractor import extract_plain_text
 from .skills_analyzer import VectorSkillsAnalyzer
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+PARSER_VERSION = "2"
+
 
 class DocumentParser:
 
-    def __init__(self):
+    def __init__(self, seed_skill_database: bool = True):
         try:
             self.nlp = spacy.load(settings.SPACY_MODEL)
         except OSError:
@@ -22,28 +29,95 @@ class DocumentParser:
             raise
 
         try:
-            self.sentence_transformer = SentenceTransformer(
-                settings.SENTENCE_TRANSFORMER_MODEL,
-                device='cpu',
-                cache_folder='./.sentence_transformers_cache'
-            )
+            sentence_model, embedding_backend = load_verified_sentence_model()
         except Exception as e:
             logger.error(
-                f"Sentence Transformer Model not found::{settings.SENTENCE_TRANSFORMER_MODEL}")
+                f"Sentence Transformer Model not found::{settings.SENTENCE_TRANSFORMER_MODEL}::{settings.EMBEDDING_BACKEND}")
             raise
 
-        self.analyzer = VectorSkillsAnalyzer(self.sentence_transformer)
-
-    def parse_document(self, file_path: str, file_type: str) -> Dict[str, Any]:
+        model_key = f"{settings.SENTENCE_TRANSFORMER_MODEL}:{embedding_backend}"
+        self.sentence_transformer = CachedSentenceEncoder(
+            sentence_model,
+            model_key,
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            disk_path=settings.EMBEDDING_CACHE_PATH or None,
+            mmap_size=settings.EMBEDDING_CACHE_MMAP_SIZE,
+            disk_max_entries=settings.EMBEDDING_CACHE_DISK_MAX_ENTRIES
+        )
+
+        self.analyzer = VectorSkillsAnalyzer(
+            self.sentence_transformer, model_key, seed_database=seed_skill_database)
+        self.model_key = model_key
+
+        self.parse_cache = TieredCache(
+            LRUCache(settings.PARSE_CACHE_SIZE,
+                     ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS),
+            DiskCache(settings.PARSE_CACHE_DIR,
+                      ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS,
+                      max_bytes=settings.PARSE_CACHE_MAX_BYTES) if settings.PARSE_CACHE_DIR else None
+        )
+
+    def _parse_cache_key(self, content_hash: str, file_type: str,
+                         outputs: Optional[Collection[str]] = None) -> str:
+        requested = ','.join(sorted(outputs)) if outputs is not None else "*"
+        version = '\0'.join([
+            PARSER_VERSION, self.model_key, self.analyzer.taxonomy_version, file_type,
+            settings.DOCX_EXTRACTOR, str(settings.PDF_MAX_PAGES), str(settings.LAYOUT_HINTS_ENABLED),
+            requested, content_hash
+        ])
+        return hashlib.sha256(version.encode('utf-8')).hexdigest()
+
+    def get_cached_parse(self, content_hash: str, file_type: str,
+                         outputs: Optional[Collection[str]] = None) -> Optional[Dict[str, Any]]:
+        cached = self.parse_cache.get(
+            self._parse_cache_key(content_hash, file_type, outputs))
+        if cached is not None:
+            logger.info(f"Parse cache hit::{content_hash[:12]}")
+        return cached
+
+    def store_parse(self, content_hash: str, file_type: str, parsed: Dict[str, Any],
+                    outputs: Optional[Collection[str]] = None):
+        if parsed.get("raw_text", "").strip():
+            self.parse_cache.put(
+                self._parse_cache_key(content_hash, file_type, outputs), parsed)
+
+    def parse_document(self, source: Union[str, BinaryIO], file_type: str,
+                       content_hash: Optional[str] = None,
+                       outputs: Optional[Collection[str]] = None) -> Dict[str, Any]:
+        if content_hash:
+            cached = self.get_cached_parse(content_hash, file_type, outputs)
+            if cached is not None:
+                return cached
+
+        parsed = self._parse_document(source, file_type, outputs)
+
+        if content_hash:
+            self.store_parse(content_hash, file_type, parsed, outputs)
+        return parsed
+
+    def _parse_document(self, source: Union[str, BinaryIO], file_type: str,
+                        outputs: Optional[Collection[str]] = None) -> Dict[str, Any]:
         try:
+            use_layout = settings.LAYOUT_HINTS_ENABLED and (
+                outputs is None or len(outputs) > 0)
+            layout_hints: Dict[str, str] = {}
+
             if file_type == "pdf":
-                text = self.extract_pdf_text(file_path)
+                if use_layout:
+                    text, layout_hints = self.extract_pdf_text_with_layout(source)
+                else:
+                    text = self.extract_pdf_text(source)
             elif file_type == "docx":
-                text = self.extract_docx_text(file_path)
+                if use_layout:
+                    text, layout_hints = self.extract_docx_text_with_layout(source)
+                else:
+                    text = self.extract_docx_text(source)
+            elif file_type == "txt":
+                text = self.extract_txt_text(source)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
             if text.strip():
-                return self.parse_text(text)
+                return self.parse_text(text, outputs, layout_hints)
             else:
                 return {"raw_text": text}
 
@@ -51,23 +125,38 @@ class DocumentParser:
             logger.error(f"Error parsing document::{str(e)}")
             raise
 
-    def extract_pdf_text(self, file_path: str) -> str:
+    def _rewind(self, source: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source
+
+    def extract_pdf_text(self, source: Union[str, BinaryIO]) -> str:
         try:
-            laparams = LAParams(
-                line_margin=0.5,
-                char_margin=0.1,
-                word_margin=2.0,
-                boxes_flow=0.5,
-                all_texts=False
-            )
-            return extract_text(file_path, laparams=laparams)
+            return extract_pdf_text(source)
         except Exception as e:
             logger.error(f"Error extracting PDF text::{str(e)}")
             return ""
 
-    def extract_docx_text(self, file_path: str) -> str:
+    def extract_pdf_text_with_layout(self, source: Union[str, BinaryIO]) -> Tuple[str, Dict[str, str]]:
         try:
-            doc = Document(file_path)
+            return extract_pdf_text_with_layout(source)
+        except Exception as e:
+            logger.error(f"Error extracting PDF text::{str(e)}")
+            return "", {}
+
+    def extract_txt_text(self, source: Union[str, BinaryIO]) -> str:
+        try:
+            return extract_plain_text(source)
+        except Exception as e:
+            logger.error(f"Error extracting Text::{str(e)}")
+            return ""
+
+    def extract_docx_text(self, source: Union[str, BinaryIO]) -> str:
+        try:
+            if settings.DOCX_EXTRACTOR == "stream":
+                return extract_docx_text(source)
+
+            doc = Document(self._rewind(source))
             text_content = []
 
             for paragraph in doc.paragraphs:
@@ -80,22 +169,49 @@ class DocumentParser:
             logger.error(f"Error extracting Docx Text::{str(e)}")
             return ""
 
-    def parse_text(self, text: str) -> Dict[str, Any]:
-        parsed_data = self.analyzer.parse_complete_resume(text)
-
-        structured_sections = {}
-        for section_name, content in parsed_data["sections"].items():
-            structured_sections[section_name] = {
-                "title": section_name.replace('_', ' ').title(),
-                "content": content,
-                "items": content.split('\n') if content else []
-            }
-
-        return {
-            "sections": structured_sections,
-            "professional_summary": parsed_data["professional_summary"],
-            "experience": parsed_data["experience"],
-            "skills": parsed_data["skills"],
-            "projects": parsed_data["projects"],
-            "raw_text": parsed_data["raw_text"],
-        }
+    def extract_docx_text_with_layout(self, source: Union[str, BinaryIO]) -> Tuple[str, Dict[str, str]]:
+        try:
+            if settings.DOCX_EXTRACTOR == "stream":
+                return extract_docx_text_with_layout(source)
+
+            doc = Document(self._rewind(source))
+            layouts = [self._paragraph_layout(paragraph) for paragraph in doc.paragraphs
+                       if paragraph.text.strip()]
+
+            return '\n'.join(layout.text for layout in layouts), classify_layout(layouts)
+        except Exception as e:
+            logger.error(f"Error extracting Docx Text::{str(e)}")
+            return "", {}
+
+    def _paragraph_layout(self, paragraph) -> LineLayout:
+        style = paragraph.style
+        style_name = (style.name or "").lower() if style is not None else ""
+        style_font = style.font if style is not None else None
+
+        runs = [run for run in paragraph.runs if run.text.strip()]
+        bold = bool(runs) and all(
+            run.bold if run.bold is not None else bool(style_font and style_font.bold)
+            for run in runs)
+        sizes = [run.font.size or (style_font.size if style_font else None)
+                 for run in runs]
+        sizes = [size.pt for size in sizes if size is not None]
+
+        return LineLayout(paragraph.text.strip(), max(sizes) if sizes else None, bold,
+                          style_name.startswith("heading") or style_name == "title")
+
+    def parse_text(self, text: str, outputs: Optional[Collection[str]] = None,
+                   layout_hints: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        parsed_data = self.analyzer.parse_complete_resume(
+            text, outputs, layout_hints)
+
+        if "sections" in parsed_data:
+            structured_sections = {}
+            for section_name, content in parsed_data["sections"].items():
+                structured_sections[section_name] = {
+                    "title": section_name.replace('_', ' ').title(),
+                    "content": content,
+                    "items": content.split('\n') if content else []
+                }
+            parsed_data["sections"] = structured_sections
+
+        return parsed_data
@@ -0,0 +1,283 @@
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from .layout_features import LineLayout, classify_layout
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+PARAGRAPH = f"{W_NS}p"
+RUN = f"{W_NS}r"
+TEXT = f"{W_NS}t"
+TAB = f"{W_NS}tab"
+BREAKS = {f"{W_NS}br", f"{W_NS}cr"}
+RUN_PROPERTIES = f"{W_NS}rPr"
+RUN_STYLE = f"{W_NS}rPr/{W_NS}rStyle"
+PARAGRAPH_STYLE = f"{W_NS}pPr/{W_NS}pStyle"
+OUTLINE_LEVEL = f"{W_NS}pPr/{W_NS}outlineLvl"
+PARAGRAPH_PROPERTIES = f"{W_NS}pPr"
+
+REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+PACKAGE_RELS_PART = "_rels/.rels"
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+OFFICE_DOCUMENT_REL = "/officeDocument"
+HEADER_REL = "/header"
+FOOTER_REL = "/footer"
+PART_NUMBER_PATTERN = re.compile(r'(\d+)\.xml$')
+
+
+def _part_order(name: str) -> Tuple[int, str]:
+    match = PART_NUMBER_PATTERN.search(name)
+    return (int(match.group(1)) if match else 0, name)
+
+
+def text_part_names(document_part: str, header_parts: List[str], footer_parts: List[str]) -> List[str]:
+    return (sorted(header_parts, key=_part_order) + [document_part]
+            + sorted(footer_parts, key=_part_order))
+
+
+def _relationships(archive: zipfile.ZipFile, rels_part: str, base_dir: str) -> List[Tuple[str, str]]:
+    if rels_part not in archive.namelist():
+        return []
+
+    with archive.open(rels_part) as part:
+        root = ET.parse(part).getroot()
+
+    relationships = []
+    for relationship in root.iter(f"{REL_NS}Relationship"):
+        if relationship.get("TargetMode") == "External":
+            continue
+        target = relationship.get("Target", "")
+        target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(
+            posixpath.join(base_dir, target))
+        relationships.append((relationship.get("Type", ""), target))
+    return relationships
+
+
+def docx_text_parts(archive: zipfile.ZipFile) -> List[str]:
+    names = set(archive.namelist())
+    document_part = next((target for rel_type, target in _relationships(archive, PACKAGE_RELS_PART, "")
+                          if rel_type.endswith(OFFICE_DOCUMENT_REL)), DEFAULT_DOCUMENT_PART)
+
+    base_dir = posixpath.dirname(document_part)
+    rels_part = posixpath.join(
+        base_dir, "_rels", f"{posixpath.basename(document_part)}.rels")
+    related = _relationships(archive, rels_part, base_dir)
+
+    headers = {target for rel_type, target in related
+               if rel_type.endswith(HEADER_REL) and target in names}
+    footers = {target for rel_type, target in related
+               if rel_type.endswith(FOOTER_REL) and target in names}
+    return [name for name in text_part_names(document_part, list(headers), list(footers))
+            if name in names]
+
+
+FALSE_VALUES = {"0", "false", "off"}
+DEFAULT_FONT_HALF_POINTS = 22
+
+
+class DocxStyles:
+
+    def __init__(self, archive: Optional[zipfile.ZipFile] = None):
+        self.styles: Dict[str, Dict[str, Any]] = {}
+        self.default_paragraph_style: Optional[str] = None
+        self.default_size = DEFAULT_FONT_HALF_POINTS / 2
+
+        if archive is not None and STYLES_PART in archive.namelist():
+            with archive.open(STYLES_PART) as part:
+                self._load(ET.parse(part).getroot())
+
+    def _load(self, root: ET.Element):
+        default_size = root.find(
+            f"{W_NS}docDefaults/{W_NS}rPrDefault/{W_NS}rPr/{W_NS}sz")
+        if default_size is not None:
+            self.default_size = _half_points(default_size)
+
+        for style in root.iter(f"{W_NS}style"):
+            style_id = style.get(f"{W_NS}styleId")
+            if not style_id:
+                continue
+
+            name = style.find(f"{W_NS}name")
+            based_on = style.find(f"{W_NS}basedOn")
+            outline = style.find(f"{W_NS}pPr/{W_NS}outlineLvl")
+            run_properties = style.find(f"{W_NS}rPr")
+            self.styles[style_id] = {
+                "name": (name.get(f"{W_NS}val") if name is not None else style_id).lower(),
+                "based_on": based_on.get(f"{W_NS}val") if based_on is not None else None,
+                "outline": _outline_level(outline.get(f"{W_NS}val")) if outline is not None else None,
+                "bold": _bold(run_properties),
+                "size": _size(run_properties)
+            }
+            if style.get(f"{W_NS}type") == "paragraph" and style.get(f"{W_NS}default") in ("1", "true"):
+                self.default_paragraph_style = style_id
+
+    def resolve(self, style_id: Optional[str], key: str) -> Any:
+        seen = set()
+        while style_id and style_id not in seen:
+            seen.add(style_id)
+            style = self.styles.get(style_id)
+            if style is None:
+                return None
+            if style[key] is not None:
+                return style[key]
+            style_id = style["based_on"]
+        return None
+
+    def is_heading(self, style_id: Optional[str]) -> bool:
+        style = self.styles.get(style_id) if style_id else None
+        if style is None:
+            return False
+        outline = self.resolve(style_id, "outline")
+        return (style["name"].startswith("heading") or style["name"] == "title"
+                or (outline is not None and outline < 9))
+
+
+def _half_points(element: ET.Element) -> Optional[float]:
+    try:
+        return int(element.get(f"{W_NS}val")) / 2
+    except (TypeError, ValueError):
+        return None
+
+
+def _bold(run_properties: Optional[ET.Element]) -> Optional[bool]:
+    if run_properties is None:
+        return None
+    bold = run_properties.find(f"{W_NS}b")
+    if bold is None:
+        return None
+    return bold.get(f"{W_NS}val", "true").lower() not in FALSE_VALUES
+
+
+def _size(run_properties: Optional[ET.Element]) -> Optional[float]:
+    if run_properties is None:
+        return None
+    size = run_properties.find(f"{W_NS}sz")
+    return _half_points(size) if size is not None else None
+
+
+def _outline_level(value: Optional[str]) -> Optional[int]:
+    return int(value) if value and value.isdigit() else None
+
+
+def _child_val(element: ET.Element, path: str) -> Optional[str]:
+    child = element.find(path)
+    return child.get(f"{W_NS}val") if child is not None else None
+
+
+def _paragraph_layout(element: ET.Element, text: str, runs: List[Tuple[int, Optional[bool], Optional[float], Optional[str]]],
+                      styles: DocxStyles) -> LineLayout:
+    style_id = _child_val(element, PARAGRAPH_STYLE) or styles.default_paragraph_style
+    outline = _outline_level(_child_val(element, OUTLINE_LEVEL))
+    heading_style = styles.is_heading(style_id) or (
+        outline is not None and outline < 9)
+
+    paragraph_bold = styles.resolve(style_id, "bold")
+    paragraph_size = styles.resolve(style_id, "size") or styles.default_size
+
+    text_chars = bold_chars = 0
+    max_size = None
+    for chars, bold, size, run_style in runs:
+        if bold is None:
+            bold = styles.resolve(run_style, "bold")
+        if bold is None:
+            bold = paragraph_bold
+        size = size or styles.resolve(run_style, "size") or paragraph_size
+
+        text_chars += chars
+        bold_chars += chars if bold else 0
+        max_size = size if max_size is None else max(max_size, size)
+
+    is_bold = text_chars > 0 and bold_chars == text_chars
+    return LineLayout(text, max_size or paragraph_size, is_bold, heading_style)
+
+
+def iter_part_layouts(part: BinaryIO, styles: Optional[DocxStyles] = None) -> Iterator[LineLayout]:
+    buffers: List[List[str]] = []
+    paragraph_runs: List[List[Tuple[int, Optional[bool], Optional[float], Optional[str]]]] = []
+    run_starts: List[int] = []
+    fallback_depth = 0
+    properties_depth = 0
+
+    for event, element in ET.iterparse(part, events=("start", "end")):
+        tag = element.tag
+
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == "start" else -1
+            continue
+        if fallback_depth:
+            if event == "end":
+                element.clear()
+            continue
+
+        if tag == PARAGRAPH_PROPERTIES:
+            properties_depth += 1 if event == "start" else -1
+            continue
+
+        if event == "start":
+            if tag == PARAGRAPH:
+                buffers.append([])
+                paragraph_runs.append([])
+            elif tag == RUN and buffers:
+                run_starts.append(len(buffers[-1]))
+            continue
+
+        if tag == PARAGRAPH:
+            text = ''.join(buffers.pop()).strip()
+            runs = paragraph_runs.pop()
+            if text:
+                yield (LineLayout(text) if styles is None
+                       else _paragraph_layout(element, text, runs, styles))
+            element.clear()
+        elif tag == RUN:
+            if run_starts:
+                run_start = run_starts.pop()
+                if styles is not None:
+                    chars = len(''.join(buffers[-1][run_start:]).strip())
+                    if chars:
+                        run_properties = element.find(RUN_PROPERTIES)
+                        paragraph_runs[-1].append((
+                            chars, _bold(run_properties), _size(run_properties),
+                            _child_val(element, RUN_STYLE)))
+        elif buffers and run_starts and not properties_depth:
+            if tag == TEXT:
+                buffers[-1].append(element.text or '')
+            elif tag == TAB:
+                buffers[-1].append('\t')
+            elif tag in BREAKS:
+                buffers[-1].append('\n')
+
+
+def iter_part_paragraphs(part: BinaryIO) -> Iterator[str]:
+    for layout in iter_part_layouts(part):
+        yield layout.text
+
+
+def iter_docx_layouts(source: Union[str, BinaryIO], with_styles: bool = True) -> Iterator[LineLayout]:
+    with zipfile.ZipFile(source) as archive:
+        styles = DocxStyles(archive) if with_styles else None
+        for part_name in docx_text_parts(archive):
+            with archive.open(part_name) as part:
+                yield from iter_part_layouts(part, styles)
+
+
+def iter_docx_paragraphs(source: Union[str, BinaryIO]) -> Iterator[str]:
+    for layout in iter_docx_layouts(source, with_styles=False):
+        yield layout.text
+
+
+def extract_docx_text(source: Union[str, BinaryIO]) -> str:
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return '\n'.join(iter_docx_paragraphs(source))
+
+
+def extract_docx_text_with_layout(source: Union[str, BinaryIO]) -> Tuple[str, Dict[str, str]]:
+    if hasattr(source, "seek"):
+        source.seek(0)
+    layouts = list(iter_docx_layouts(source))
+    return '\n'.join(layout.text for layout in layouts), classify_layout(layouts)
@@ -0,0 +1,183 @@
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from sentence_transformers import SentenceTransformer
+
+from ..config import settings
+from .header_classifier import HeaderClassifier, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+MODEL_CACHE_FOLDER = './.sentence_transformers_cache'
+
+ACCURACY_FIXTURE_LINES = [
+    "PROFESSIONAL SUMMARY", "Work Experience:", "Key Projects", "TECHNICAL SKILLS",
+    "Programming Languages:", "Web Technologies", "Databases", "DevOps & Cloud",
+    "Machine Learning", "Version Control", "Testing Tools", "Development Tools",
+    "Education", "Certifications", "Employment History", "About Me", "Tech Stack",
+    "Side Projects", "Career Objective", "Frontend", "Cloud Platforms",
+    "Developed a REST API serving 10k requests per day",
+    "Software Engineer January 2023 - Present",
+    "Python, JavaScript, TypeScript, Go",
+    "Bachelor of Technology in Computer Science",
+    "john.doe@example.com | +1 555 123 4567",
+]
+
+ACCURACY_FIXTURE_SKILLS = [
+    "python3", "ReactJS", "react", "Postgres", "Mongo", "node", "Express",
+    "Amazon Web Services", "k8s", "CI CD pipelines", "Tensorflow 2", "sklearn",
+    "Github Actions", "pytest", "VS Code", "IntelliJ IDEA", "Tailwind",
+    "Rest APIs", "Communication", "Team Leadership",
+]
+
+
+def load_sentence_model(backend: Optional[str] = None) -> SentenceTransformer:
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unsupported embedding backend: {backend}. Allowed: {EMBEDDING_BACKENDS}")
+    return _load_sentence_model(backend)
+
+
+def load_verified_sentence_model() -> Tuple[SentenceTransformer, str]:
+    """The configured model and backend, or torch when verification finds any changed classification."""
+    backend = settings.EMBEDDING_BACKEND
+    sentence_model = load_sentence_model(backend)
+    if settings.EMBEDDING_BACKEND_VERIFY and check_configured_backend()["mismatches"]:
+        logger.error(f"Embedding backend {backend} changes fixture classifications::falling back to torch")
+        return load_sentence_model("torch"), "torch"
+    return sentence_model, backend
+
+
+@lru_cache(maxsize=None)
+def _load_sentence_model(backend: str) -> SentenceTransformer:
+    model_name = settings.SENTENCE_TRANSFORMER_MODEL
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, device='cpu', cache_folder=MODEL_CACHE_FOLDER)
+
+    if backend == "onnx":
+        return SentenceTransformer(model_name, device='cpu', cache_folder=MODEL_CACHE_FOLDER,
+                                   backend="onnx")
+
+    try:
+        return SentenceTransformer(model_name, device='cpu', cache_folder=MODEL_CACHE_FOLDER,
+                                   backend="onnx",
+                                   model_kwargs={"file_name": settings.EMBEDDING_ONNX_QUANTIZED_FILE})
+    except Exception as e:
+        logger.warning(
+            f"Quantized ONNX file not available::{settings.EMBEDDING_ONNX_QUANTIZED_FILE}::{str(e)}")
+
+    return _export_quantized_model(model_name)
+
+
+def _export_quantized_model(model_name: str) -> SentenceTransformer:
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    export_dir = os.path.join(
+        MODEL_CACHE_FOLDER, f"{model_name.replace('/', '_')}-onnx-int8")
+    quantized_file = "onnx/model_int8.onnx"
+
+    if not os.path.exists(os.path.join(export_dir, quantized_file)):
+        logger.info(f"Exporting int8 ONNX model::{model_name}::{export_dir}")
+        onnx_model = SentenceTransformer(model_name, device='cpu', cache_folder=MODEL_CACHE_FOLDER,
+                                         backend="onnx")
+        onnx_model.save(export_dir)
+        export_dynamic_quantized_onnx_model(
+            onnx_model, settings.EMBEDDING_ONNX_QUANTIZATION, export_dir, file_suffix="int8")
+
+    return SentenceTransformer(export_dir, device='cpu', backend="onnx",
+                               model_kwargs={"file_name": quantized_file})
+
+
+def _fixture_header_lists() -> Dict[str, List[str]]:
+    from .project_analyzer import PROJECT_HEADERS
+    from .skills_analyzer import SKILL_HEADERS, SKILL_SUB_HEADERS
+    from .summary_analyzer import SUMMARY_HEADERS
+    from .work_experience_analyzer import EXPERIENCE_HEADERS
+
+    header_lists = {
+        "skills": SKILL_HEADERS,
+        "experience": EXPERIENCE_HEADERS,
+        "projects": PROJECT_HEADERS,
+        "professional_summary": SUMMARY_HEADERS,
+    }
+    for category, headers in SKILL_SUB_HEADERS.items():
+        header_lists[f"sub_{category}"] = headers
+    return header_lists
+
+
+def _classify_fixture(sentence_model) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    from .skills_analyzer import SKILL_PATTERNS
+
+    header_lists = _fixture_header_lists()
+    classifier = HeaderClassifier(sentence_model)
+    classifier.register_many(header_lists)
+
+    section_labels = ["skills", "experience",
+                      "projects", "professional_summary"]
+    sub_labels = [label for label in header_lists if label.startswith("sub_")]
+    scores = classifier.score(sentence_model.encode(ACCURACY_FIXTURE_LINES))
+
+    header_results = []
+    for row in scores:
+        section, _ = classifier.best_label(row, section_labels, 0.6)
+        sub_section, _ = classifier.best_label(row, sub_labels, 0.65)
+        header_results.append(section or sub_section)
+
+    taxonomy = [(category, skill) for category, skills in SKILL_PATTERNS.items()
+                for skill in skills]
+    taxonomy_matrix = normalize_rows(sentence_model.encode(
+        [skill for _, skill in taxonomy]))
+    similarities = normalize_rows(
+        sentence_model.encode(ACCURACY_FIXTURE_SKILLS)) @ taxonomy_matrix.T
+
+    skill_results = []
+    for row in similarities:
+        best = int(row.argmax())
+        skill_results.append(taxonomy[best][0] if row[best] > 0.7 else None)
+
+    return header_results, skill_results
+
+
+def verify_backend_accuracy(candidate_model, reference_model) -> Dict[str, Any]:
+    candidate_headers, candidate_skills = _classify_fixture(candidate_model)
+    reference_headers, reference_skills = _classify_fixture(reference_model)
+
+    mismatches = [
+        {"text": line, "expected": expected, "actual": actual}
+        for line, expected, actual in zip(ACCURACY_FIXTURE_LINES, reference_headers, candidate_headers)
+        if expected != actual
+    ] + [
+        {"text": skill, "expected": expected, "actual": actual}
+        for skill, expected, actual in zip(ACCURACY_FIXTURE_SKILLS, reference_skills, candidate_skills)
+        if expected != actual
+    ]
+
+    total = len(reference_headers) + len(reference_skills)
+    return {
+        "total": total,
+        "agreement": (total - len(mismatches)) / total if total else 1.0,
+        "mismatches": mismatches
+    }
+
+
+def check_configured_backend() -> Dict[str, Any]:
+    if settings.EMBEDDING_BACKEND == "torch":
+        return {"total": 0, "agreement": 1.0, "mismatches": []}
+
+    result = verify_backend_accuracy(
+        load_sentence_model(), load_sentence_model("torch"))
+    if result["mismatches"]:
+        logger.warning(
+            f"Embedding backend {settings.EMBEDDING_BACKEND} disagrees with torch on "
+            f"{len(result['mismatches'])}/{result['total']} fixtures::{result['mismatches']}")
+    else:
+        logger.info(
+            f"Embedding backend {settings.EMBEDDING_BACKEND} matches torch on all {result['total']} fixtures")
+    return result
+
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+from typing import Any, Dict, List, Optional
+from .cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Rows written between checks of the disk store's row cap
+PRUNE_INTERVAL = 1000
+
+
+class EmbeddingDiskStore:
+
+    def __init__(self, path: str, mmap_size: int, max_entries: int = 0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_entries = max_entries
+        self._writes_since_prune = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL DEFAULT 0)")
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(embeddings)")}
+        if "last_used" not in columns:
+            self.connection.execute(
+                "ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self.connection.commit()
+
+        with self._lock:
+            self._prune()
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' for _ in chunk)
+                rows = self.connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk)
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+
+            if found:
+                self.connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key in found])
+                self.connection.commit()
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            self.connection.executemany(
+                "INSERT INTO embeddings (key, vector, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET last_used = excluded.last_used",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                 for key, vector in items.items()]
+            )
+            self.connection.commit()
+
+            self._writes_since_prune += len(items)
+            if self._writes_since_prune >= PRUNE_INTERVAL:
+                self._prune()
+
+    def _prune(self):
+        # Counted in the shared file, so the cap holds across every process using it
+        self._writes_since_prune = 0
+        if not self.max_entries:
+            return
+
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        if count <= self.max_entries:
+            return
+
+        self.connection.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (count - self.max_entries,))
+        self.connection.commit()
+        self.evictions += count - self.max_entries
+        logger.info(f"Pruned embedding disk cache::{count - self.max_entries} rows")
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+
+class CachedSentenceEncoder:
+
+    def __init__(self, sentence_model, model_name: str, max_entries: int,
+                 disk_path: Optional[str] = None, mmap_size: int = 0, disk_max_entries: int = 0):
+        self.sentence_model = sentence_model
+        self.model_name = model_name
+        self.memory = LRUCache(max_entries)
+        self.disk = None
+        self.disk_hits = 0
+        self.encoded = 0
+
+        if disk_path:
+            try:
+                self.disk = EmbeddingDiskStore(disk_path, mmap_size, disk_max_entries)
+            except sqlite3.Error as e:
+                logger.error(
+                    f"Embedding disk cache unavailable::{disk_path}::{str(e)}")
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "sentence_model":
+            raise AttributeError(name)
+        return getattr(self.sentence_model, name)
+
+    def _normalize(self, text: str) -> str:
+        return ' '.join(unicodedata.normalize('NFC', text).split())
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{self._normalize(text)}".encode('utf-8')).hexdigest()
+
+    def encode(self, sentences, **kwargs):
+        if kwargs:
+            return self.sentence_model.encode(sentences, **kwargs)
+
+        is_single = isinstance(sentences, str)
+        texts = [sentences] if is_single else list(sentences)
+        if not texts:
+            return self.sentence_model.encode(texts)
+
+        keys = [self._key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self.memory.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing and self.disk is not None:
+            disk_vectors = self.disk.get_many(list(missing.keys()))
+            for key, vector in disk_vectors.items():
+                vectors[key] = vector
+                self.memory.put(key, vector)
+                del missing[key]
+            self.disk_hits += len(disk_vectors)
+
+        if missing:
+            missing_keys = list(missing.keys())
+            new_vectors = np.asarray(self.sentence_model.encode(
+                [self._normalize(missing[key]) for key in missing_keys]), dtype=np.float32)
+            self.encoded += len(missing_keys)
+
+            # Own copies, so a cached row does not keep the whole batch array alive
+            new_items = {key: vector.copy() for key, vector in zip(missing_keys, new_vectors)}
+            for key, vector in new_items.items():
+                vectors[key] = vector
+                self.memory.put(key, vector)
+            if self.disk is not None:
+                self.disk.put_many(new_items)
+
+        embeddings = np.stack([vectors[key] for key in keys])
+        return embeddings[0] if is_single else embeddings
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats.update({
+            "model": self.model_name,
+            "disk_enabled": self.disk is not None,
+            "disk_hits": self.disk_hits,
+            "disk_evictions": self.disk.evictions if self.disk is not None else 0,
+            "encoded": self.encoded
+        })
+        return stats
@@ -0,0 +1,198 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Collection, Dict, Optional, Tuple, Union
+
+from ..config import settings
+from .upload_stream import SpooledUpload
+
+if TYPE_CHECKING:
+    from .doc_generator import LoadedDocument
+
+logger = logging.getLogger(__name__)
+
+_cpu_executor: Optional[Executor] = None
+_document_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_parser = None
+
+_worker_counters: Dict[str, Counter] = {
+    "header_detection_stages": Counter(),
+    "embedding_cache": Counter()
+}
+_counters_lock = threading.Lock()
+
+
+def build_worker_parser():
+    from .document_parser import DocumentParser
+
+    return DocumentParser(seed_skill_database=False)
+
+
+worker_parser_factory: Callable[[], Any] = build_worker_parser
+
+
+def _init_worker(parser_factory: Callable[[], Any]):
+    global _worker_parser
+    # Workers already parse documents side by side; a PDF page pool in each would multiply processes
+    settings.PDF_EXTRACT_MODE = "serial"
+    _worker_parser = parser_factory()
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _parser_counters() -> Dict[str, Counter]:
+    encoder = _worker_parser.sentence_transformer
+    memory = encoder.memory
+    return {
+        "header_detection_stages": Counter(_worker_parser.analyzer.header_stage_counts),
+        "embedding_cache": Counter({"hits": memory.hits, "misses": memory.misses,
+                                    "disk_hits": encoder.disk_hits, "encoded": encoder.encoded})
+    }
+
+
+def _parse_in_worker(data: bytes, file_type: str,
+                     outputs: Optional[Collection[str]] = None) -> Tuple[Dict[str, Any], Dict[str, Counter]]:
+    before = _parser_counters()
+    parsed = _worker_parser.parse_document(io.BytesIO(data), file_type, outputs=outputs)
+    after = _parser_counters()
+    return parsed, {name: after[name] - before[name] for name in after}
+
+
+def _record_worker_counters(counters: Dict[str, Counter]):
+    with _counters_lock:
+        for name, values in counters.items():
+            _worker_counters[name].update(values)
+
+
+def worker_stats() -> Dict[str, Dict[str, int]]:
+    """Counters summed over all pool workers; per-worker state such as cache sizes is not included."""
+    with _counters_lock:
+        return {name: dict(values) for name, values in _worker_counters.items()}
+
+
+def uses_process_pool() -> bool:
+    return settings.CPU_EXECUTOR == "process"
+
+
+def get_cpu_executor() -> Executor:
+    global _cpu_executor
+    with _executor_lock:
+        if _cpu_executor is None:
+            if uses_process_pool():
+                _cpu_executor = ProcessPoolExecutor(
+                    max_workers=settings.CPU_EXECUTOR_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(worker_parser_factory,)
+                )
+            else:
+                _cpu_executor = ThreadPoolExecutor(
+                    max_workers=settings.CPU_EXECUTOR_WORKERS,
+                    thread_name_prefix="cpu-stage"
+                )
+            logger.info(
+                f"Started CPU executor::{settings.CPU_EXECUTOR}::workers={settings.CPU_EXECUTOR_WORKERS}")
+        return _cpu_executor
+
+
+def _discard_executor(executor: Executor):
+    global _cpu_executor
+    with _executor_lock:
+        if _cpu_executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            _cpu_executor = None
+
+
+async def warm_up_executor():
+    """Start every process pool worker and load its models before the first request."""
+    if not uses_process_pool():
+        return
+
+    loop = asyncio.get_running_loop()
+    executor = get_cpu_executor()
+    pids = await asyncio.gather(*[loop.run_in_executor(executor, _worker_ready)
+                                  for _ in range(settings.CPU_EXECUTOR_WORKERS)])
+    logger.info(f"CPU executor warmed up::workers={len(set(pids))}")
+
+
+def get_document_executor() -> Executor:
+    """Threads for DOCX loading and generation, so a LoadedDocument stays usable between the two."""
+    global _document_executor
+    if not uses_process_pool():
+        return get_cpu_executor()
+
+    with _executor_lock:
+        if _document_executor is None:
+            _document_executor = ThreadPoolExecutor(
+                max_workers=settings.CPU_EXECUTOR_WORKERS,
+                thread_name_prefix="docx-stage"
+            )
+        return _document_executor
+
+
+async def parse_upload(parser, upload: SpooledUpload, file_type: str,
+                       outputs: Optional[Collection[str]] = None) -> Dict[str, Any]:
+    if outputs is not None:
+        outputs = tuple(outputs)
+
+    cached = parser.get_cached_parse(upload.sha256, file_type, outputs)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    if uses_process_pool():
+        executor = get_cpu_executor()
+        try:
+            parsed, counters = await loop.run_in_executor(
+                executor, _parse_in_worker, upload.read_bytes(), file_type, outputs)
+        except BrokenProcessPool:
+            # A crashed worker breaks the whole pool; the next request starts a fresh one
+            logger.error("CPU executor process pool is broken::replacing it")
+            _discard_executor(executor)
+            raise
+        _record_worker_counters(counters)
+    else:
+        parsed = await loop.run_in_executor(
+            get_cpu_executor(), partial(parser.parse_document, outputs=outputs),
+            upload.stream(), file_type)
+
+    parser.store_parse(upload.sha256, file_type, parsed, outputs)
+    return parsed
+
+
+async def load_document(generator, upload: SpooledUpload) -> "LoadedDocument":
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_document_executor(), generator.load_document, upload.stream())
+
+
+async def generate_tailored_resume(generator, source: Union[SpooledUpload, "LoadedDocument"],
+                                   extracted_data: Dict[str, Any], tailored_data: Dict[str, Any],
+                                   output_path: str) -> str:
+    loop = asyncio.get_running_loop()
+    if isinstance(source, SpooledUpload):
+        source = source.stream()
+
+    return await loop.run_in_executor(
+        get_document_executor(), generator.generate_tailored_resume, source,
+        extracted_data, tailored_data, output_path)
+
+
+def shutdown_executor():
+    global _cpu_executor, _document_executor
+    with _executor_lock:
+        for executor in (_cpu_executor, _document_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
+        _document_executor = None
@@ -0,0 +1,98 @@
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+LEADING_BULLET_PATTERN = re.compile(r'^[•●▪▫◦‣⁃\-\*\+]+\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_header(text: str) -> str:
+    text = LEADING_BULLET_PATTERN.sub('', text.strip().lower())
+    text = text.rstrip(':').strip()
+    return WHITESPACE_PATTERN.sub(' ', text)
+
+
+def normalize_rows(embeddings) -> np.ndarray:
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+class HeaderClassifier:
+
+    def __init__(self, sentence_model):
+        self.sentence_model = sentence_model
+        self.headers: Dict[str, List[str]] = {}
+        self.labels: List[str] = []
+        self.label_positions: Dict[str, int] = {}
+        self.header_matrix = None
+        self.label_offsets = np.zeros(0, dtype=np.intp)
+        self.lexicon: Dict[str, Set[str]] = {}
+
+    def add_lexicon(self, label: str, headers: Iterable[str]):
+        for header in headers:
+            self.lexicon.setdefault(normalize_header(header), set()).add(label)
+
+    def register(self, label: str, headers: List[str]):
+        self.register_many({label: headers})
+
+    def register_many(self, header_lists: Dict[str, List[str]]):
+        pending = {label: list(headers) for label, headers in header_lists.items()
+                   if label not in self.label_positions and headers}
+        if not pending:
+            return
+
+        all_headers = [header for headers in pending.values()
+                       for header in headers]
+        embeddings = normalize_rows(self.sentence_model.encode(all_headers))
+
+        offset = 0 if self.header_matrix is None else len(self.header_matrix)
+        offsets = []
+        for label, headers in pending.items():
+            offsets.append(offset)
+            offset += len(headers)
+            self.label_positions[label] = len(self.labels)
+            self.labels.append(label)
+            self.headers[label] = headers
+            self.add_lexicon(label, headers)
+
+        if self.header_matrix is None:
+            self.header_matrix = embeddings
+        else:
+            self.header_matrix = np.vstack([self.header_matrix, embeddings])
+        self.label_offsets = np.append(
+            self.label_offsets, offsets).astype(np.intp)
+
+    def score(self, embeddings) -> np.ndarray:
+        embeddings = normalize_rows(embeddings)
+        if self.header_matrix is None:
+            return np.zeros((len(embeddings), 0), dtype=np.float32)
+
+        similarities = embeddings @ self.header_matrix.T
+        return np.maximum.reduceat(similarities, self.label_offsets, axis=1)
+
+    def label_row(self, labels: Iterable[str], confidence: float = 1.0) -> np.ndarray:
+        row = np.zeros(len(self.labels), dtype=np.float32)
+        for label in labels:
+            if label in self.label_positions:
+                row[self.label_positions[label]] = confidence
+        return row
+
+    def best_label(self, scores: np.ndarray, labels: Optional[List[str]] = None,
+                   threshold: float = 0.0) -> Tuple[Optional[str], float]:
+        return self._best_labels(np.atleast_2d(scores), labels, threshold)[0]
+
+    def _best_labels(self, scores: np.ndarray, labels: Optional[List[str]],
+                     threshold: float) -> List[Tuple[Optional[str], float]]:
+        candidates = labels if labels is not None else self.labels
+        if not candidates:
+            return [(None, 0.0) for _ in range(len(scores))]
+
+        candidate_scores = scores[:, [self.label_positions[label]
+                                      for label in candidates]]
+        best = candidate_scores.argmax(axis=1)
+        best_scores = candidate_scores[np.arange(len(best)), best]
+
+        return [(candidates[idx] if score > threshold else None, float(score))
+                for idx, score in zip(best, best_scores)]
@@ -0,0 +1,134 @@
+import copy
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from .cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+URL_PATTERN = re.compile(r'https?://[^\s<>"\')\]]+', re.IGNORECASE)
+TRACKING_PARAM_PATTERN = re.compile(
+    r'^(?:utm_\w+|gclid|fbclid|msclkid|mc_[ce]id|_hs\w+|trk\w*|ref|refid|src|source|campaign)$',
+    re.IGNORECASE)
+
+EMBEDDING_CHUNK_WORDS = 200
+
+
+def _strip_tracking(match: re.Match) -> str:
+    parts = urlsplit(match.group(0))
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not TRACKING_PARAM_PATTERN.match(name)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'),
+                       urlencode(query), ''))
+
+
+def normalize_jd_text(text: str) -> str:
+    text = unicodedata.normalize('NFKC', text)
+    text = URL_PATTERN.sub(_strip_tracking, text)
+    return ' '.join(text.casefold().split())
+
+
+class JDRequirementsCache:
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None,
+                 semantic_threshold: float = 0.0, sentence_model_loader=None):
+        self.entries = LRUCache(max_entries, ttl_seconds)
+        self.semantic_threshold = semantic_threshold
+        self.sentence_model_loader = sentence_model_loader
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.semantic_threshold > 0 and self.sentence_model_loader is not None
+
+    def key(self, normalized_text: str) -> str:
+        return hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+
+    def embed(self, normalized_text: str) -> np.ndarray:
+        # MiniLM truncates long inputs, so the whole posting is embedded in chunks and mean-pooled
+        words = normalized_text.split()
+        chunks = [' '.join(words[start:start + EMBEDDING_CHUNK_WORDS])
+                  for start in range(0, len(words), EMBEDDING_CHUNK_WORDS)] or ['']
+        vectors = np.asarray(self.sentence_model_loader().encode(
+            chunks, normalize_embeddings=True), dtype=np.float32)
+        vector = vectors.mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self.lookups += 1
+        value = self.entries.get(key)
+        if value is None:
+            return None
+
+        with self._lock:
+            self.exact_hits += 1
+        return copy.deepcopy(value)
+
+    def get_similar(self, vector: np.ndarray) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self._vectors:
+                return None
+            keys = list(self._vectors.keys())
+            matrix = np.stack(list(self._vectors.values()))
+
+        similarities = matrix @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.semantic_threshold:
+            return None
+
+        value = self.entries.get(keys[best])
+        with self._lock:
+            if value is None:
+                self._vectors.pop(keys[best], None)
+                return None
+            self.semantic_hits += 1
+
+        logger.info(
+            f"JD cache semantic hit::similarity={similarities[best]:.4f}")
+        return copy.deepcopy(value)
+
+    def put(self, key: str, requirements: Dict[str, Any], vector: Optional[np.ndarray] = None):
+        self.entries.put(key, copy.deepcopy(requirements))
+        if vector is None:
+            return
+
+        with self._lock:
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.entries.max_entries:
+                self._vectors.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        with self._lock:
+            self._vectors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        entry_stats = self.entries.stats()
+        hits = self.exact_hits + self.semantic_hits
+        return {
+            "entries": entry_stats["entries"],
+            "max_entries": entry_stats["max_entries"],
+            "evictions": entry_stats["evictions"],
+            "expirations": entry_stats["expirations"],
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "semantic_enabled": self.semantic_enabled,
+            "semantic_threshold": self.semantic_threshold,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0
+        }
@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+WORD_CHARS = frozenset('+#')
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char in WORD_CHARS
+
+
+class KeywordAutomaton:
+
+    def __init__(self, keywords: Dict[str, Iterable[Hashable]]):
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output_link: List[int] = [0]
+        self.terminal: List[int] = [-1]
+        self.keywords: List[str] = []
+        self.values: List[Set[Hashable]] = []
+
+        for keyword, values in keywords.items():
+            self._add(keyword.lower(), values)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _add(self, keyword: str, values: Iterable[Hashable]):
+        if not keyword:
+            return
+
+        node = 0
+        for char in keyword:
+            next_node = self.transitions[node].get(char)
+            if next_node is None:
+                next_node = len(self.transitions)
+                self.transitions[node][char] = next_node
+                self.transitions.append({})
+                self.fail.append(0)
+                self.output_link.append(0)
+                self.terminal.append(-1)
+            node = next_node
+
+        if self.terminal[node] == -1:
+            self.terminal[node] = len(self.keywords)
+            self.keywords.append(keyword)
+            self.values.append(set())
+        self.values[self.terminal[node]].update(values)
+
+    def _build_links(self):
+        queue = deque(self.transitions[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self.transitions[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+
+                fail_node = self.fail[child]
+                self.output_link[child] = (fail_node if self.terminal[fail_node] != -1
+                                           else self.output_link[fail_node])
+                queue.append(child)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        text = text.lower()
+        matches = []
+        node = 0
+
+        for end, char in enumerate(text, start=1):
+            while node and char not in self.transitions[node]:
+                node = self.fail[node]
+            node = self.transitions[node].get(char, 0)
+
+            match_node = node if self.terminal[node] != -1 else self.output_link[node]
+            while match_node:
+                keyword_id = self.terminal[match_node]
+                start = end - len(self.keywords[keyword_id])
+                if self._on_word_boundary(text, start, end):
+                    matches.append((start, end, keyword_id))
+                match_node = self.output_link[match_node]
+
+        return matches
+
+    def _on_word_boundary(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and is_word_char(text[start]) and is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and is_word_char(text[end - 1]) and is_word_char(text[end]):
+            return False
+        return True
+
+    def match_values(self, text: str) -> Set[Hashable]:
+        found = set()
+        for _, _, keyword_id in self.find_all(text):
+            found.update(self.values[keyword_id])
+        return found
@@ -0,0 +1,48 @@
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict
+
+import numpy as np
+
+
+class LatencyTracker:
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.window))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, route: str, seconds: float):
+        with self._lock:
+            self._samples[route].append(seconds)
+            self._counts[route] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = {route: list(values)
+                       for route, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        report = {}
+        for route, values in samples.items():
+            p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99])
+            report[route] = {
+                "count": counts[route],
+                "window": len(values),
+                "p50_ms": round(p50 * 1000, 2),
+                "p90_ms": round(p90 * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "p99_ms": round(p99 * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2)
+            }
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+latency_tracker = LatencyTracker()
@@ -0,0 +1,66 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+HEADING = "heading"
+EMPHASIS = "emphasis"
+BODY = "body"
+
+LAYOUT_STRENGTH = {BODY: 0, EMPHASIS: 1, HEADING: 2}
+
+BOLD_FONT_PATTERN = re.compile(r'bold|black|heavy|semibold|demi', re.IGNORECASE)
+
+
+class LineLayout(NamedTuple):
+    text: str
+    size: Optional[float] = None
+    bold: bool = False
+    heading_style: bool = False
+
+
+def is_bold_font(font_name: str) -> bool:
+    return bool(font_name) and BOLD_FONT_PATTERN.search(font_name) is not None
+
+
+def _body_size(lines: List[LineLayout]) -> Optional[float]:
+    weights = Counter()
+    for line in lines:
+        if line.size:
+            weights[round(line.size * 2) / 2] += len(line.text)
+    return weights.most_common(1)[0][0] if weights else None
+
+
+def _line_kind(line: LineLayout, body_size: Optional[float],
+               heading_ratio: float, emphasis_ratio: float) -> str:
+    if line.heading_style:
+        return HEADING
+    if body_size and line.size and line.size >= body_size * heading_ratio:
+        return HEADING
+    if line.bold or (body_size and line.size and line.size >= body_size * emphasis_ratio):
+        return EMPHASIS
+    return BODY
+
+
+def classify_layout(lines: Iterable[LineLayout], heading_ratio: float = 1.2,
+                    emphasis_ratio: float = 1.08, max_marked_ratio: float = 0.5) -> Dict[str, str]:
+    lines = [line._replace(text=text.strip())
+             for line in lines for text in line.text.split('\n') if text.strip()]
+    if not lines:
+        return {}
+
+    body_size = _body_size(lines)
+    kinds = [_line_kind(line, body_size, heading_ratio, emphasis_ratio)
+             for line in lines]
+
+    marked_short_lines = sum(1 for line, kind in zip(lines, kinds)
+                             if kind != BODY and len(line.text.split()) <= 6)
+    marked_lines = sum(1 for kind in kinds if kind != BODY)
+    if marked_short_lines < 2 or marked_lines > len(lines) * max_marked_ratio:
+        return {}
+
+    hints: Dict[str, str] = {}
+    for line, kind in zip(lines, kinds):
+        current = hints.get(line.text)
+        if current is None or LAYOUT_STRENGTH[kind] > LAYOUT_STRENGTH[current]:
+            hints[line.text] = kind
+    return hints
@@ -0,0 +1,65 @@
+import numpy as np
+from collections import Counter
+from typing import Dict, Iterable
+
+
+class LineEmbeddingIndex:
+
+    def __init__(self, sentence_model, lines: Iterable[str]):
+        self.sentence_model = sentence_model
+        self.positions: Dict[str, int] = {}
+        self.embeddings = None
+        self.label_scores = None
+        self.stage_counts = Counter()
+        self.layout_hints: Dict[str, str] = {}
+        self.ensure_encoded(lines)
+
+    def __contains__(self, line: str) -> bool:
+        return line.strip() in self.positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def ensure_encoded(self, lines: Iterable[str]):
+        missing = []
+        for line in lines:
+            line = line.strip()
+            if line and line not in self.positions:
+                self.positions[line] = len(self.positions)
+                missing.append(line)
+
+        if not missing:
+            return
+
+        new_embeddings = np.asarray(self.sentence_model.encode(missing))
+        if self.embeddings is None:
+            self.embeddings = new_embeddings
+        else:
+            self.embeddings = np.vstack([self.embeddings, new_embeddings])
+
+    def get(self, line: str) -> np.ndarray:
+        line = line.strip()
+        if not line:
+            return np.asarray(self.sentence_model.encode([line]))
+        if line not in self.positions:
+            self.ensure_encoded([line])
+
+        position = self.positions[line]
+        return self.embeddings[position:position + 1]
+
+    def get_scores(self, line: str, header_classifier) -> np.ndarray:
+        line = line.strip()
+        if not line:
+            return header_classifier.score(self.get(line))[0]
+        if line not in self.positions:
+            self.ensure_encoded([line])
+
+        label_count = len(header_classifier.labels)
+        if self.label_scores is None or self.label_scores.shape[1] != label_count:
+            self.label_scores = header_classifier.score(self.embeddings)
+        elif len(self.label_scores) < len(self.embeddings):
+            new_scores = header_classifier.score(
+                self.embeddings[len(self.label_scores):])
+            self.label_scores = np.vstack([self.label_scores, new_scores])
+
+        return self.label_scores[self.positions[line]]
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+from .cache import DiskCache, LRUCache, TieredCache
+
+logger = logging.getLogger(__name__)
+
+
+def _model_name(client) -> str:
+    return str(getattr(client, "model_name", None) or getattr(client, "model", "") or type(client).__name__)
+
+
+def response_token_count(response) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    return int(token_usage.get("total_tokens") or 0)
+
+
+class LLMResponseCache:
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.latency_saved_seconds = 0.0
+        self.tokens_saved = 0
+
+    def key(self, client, messages: List[Any]) -> str:
+        payload = json.dumps({
+            "model": _model_name(client),
+            "temperature": getattr(client, "temperature", None),
+            "max_tokens": getattr(client, "max_tokens", None),
+            "messages": [[message.type, message.content] for message in messages]
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, bypass: bool = False) -> Optional[str]:
+        if bypass:
+            with self._lock:
+                self.bypasses += 1
+            return None
+
+        entry = self.cache.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.latency_saved_seconds += entry.get("latency_seconds", 0.0)
+            self.tokens_saved += entry.get("tokens", 0)
+
+        logger.info(f"LLM cache hit::{key[:12]}")
+        return entry["content"]
+
+    def put(self, key: str, content: str, latency_seconds: float, tokens: int):
+        self.cache.put(key, {
+            "content": content,
+            "latency_seconds": latency_seconds,
+            "tokens": tokens
+        })
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "latency_saved_seconds": round(self.latency_saved_seconds, 3),
+            "tokens_saved": self.tokens_saved,
+            "tiers": self.cache.stats()
+        }
+
+
+llm_response_cache = LLMResponseCache(TieredCache(
+    LRUCache(settings.LLM_CACHE_SIZE, ttl_seconds=settings.LLM_CACHE_TTL_SECONDS),
+    DiskCache(settings.LLM_CACHE_DIR,
+              ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+              max_bytes=settings.LLM_CACHE_MAX_BYTES) if settings.LLM_CACHE_DIR else None
+))
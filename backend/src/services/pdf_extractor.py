@@ -0,0 +1,140 @@
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from pdfminer.high_level import extract_pages, extract_text
+from pdfminer.layout import (LAParams, LTChar, LTContainer, LTItem, LTText,
+                             LTTextBox, LTTextLine)
+from pdfminer.pdfpage import PDFPage
+
+from ..config import settings
+from .layout_features import LineLayout, classify_layout, is_bold_font
+
+logger = logging.getLogger(__name__)
+
+PDF_LAPARAMS = {
+    "line_margin": 0.5,
+    "char_margin": 0.1,
+    "word_margin": 2.0,
+    "boxes_flow": 0.5,
+    "all_texts": False
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _read_bytes(source: Union[str, BinaryIO]) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as pdf_file:
+            return pdf_file.read()
+    source.seek(0)
+    return source.read()
+
+
+def _extract_pages(data: bytes, page_numbers: Optional[List[int]]) -> str:
+    return extract_text(io.BytesIO(data), page_numbers=page_numbers,
+                        laparams=LAParams(**PDF_LAPARAMS))
+
+
+def _line_layout(line: LTTextLine) -> LineLayout:
+    chars = [char for char in line if isinstance(char, LTChar)]
+    sizes = Counter(round(char.size * 2) / 2 for char in chars)
+    bold = bool(chars) and all(is_bold_font(char.fontname)
+                               for char in chars if char.get_text().strip())
+    return LineLayout(line.get_text().strip(),
+                      sizes.most_common(1)[0][0] if sizes else None, bold)
+
+
+def _extract_pages_with_layout(data: bytes, page_numbers: Optional[List[int]]) -> Tuple[str, List[LineLayout]]:
+    parts: List[str] = []
+    layouts: List[LineLayout] = []
+
+    def render(item: LTItem):
+        if isinstance(item, LTTextLine):
+            layouts.append(_line_layout(item))
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            parts.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            parts.append('\n')
+
+    for page in extract_pages(io.BytesIO(data), page_numbers=page_numbers,
+                              laparams=LAParams(**PDF_LAPARAMS)):
+        render(page)
+        parts.append('\f')
+
+    return ''.join(parts), layouts
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def count_pdf_pages(data: bytes) -> int:
+    return sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+
+
+def _page_chunks(page_count: int, workers: int) -> List[List[int]]:
+    chunk_size = -(-page_count // workers)
+    return [list(range(start, min(start + chunk_size, page_count)))
+            for start in range(0, page_count, chunk_size)]
+
+
+def _run_extraction(extractor, source: Union[str, BinaryIO], parallel: Optional[bool]) -> list:
+    if parallel is None:
+        parallel = settings.PDF_EXTRACT_MODE == "parallel"
+
+    data = _read_bytes(source)
+    if not parallel or settings.PDF_EXTRACT_WORKERS <= 1:
+        return [extractor(data, None)]
+
+    page_count = count_pdf_pages(data)
+    if page_count > settings.PDF_MAX_PAGES:
+        logger.warning(
+            f"Truncating parallel PDF extraction::pages={page_count}::max={settings.PDF_MAX_PAGES}")
+        page_count = settings.PDF_MAX_PAGES
+
+    workers = min(settings.PDF_EXTRACT_WORKERS, page_count)
+    if workers <= 1 or page_count < settings.PDF_PARALLEL_MIN_PAGES:
+        return [extractor(data, list(range(page_count)))]
+
+    chunks = _page_chunks(page_count, workers)
+    pool = _get_pool()
+    futures = [pool.submit(extractor, data, chunk) for chunk in chunks]
+    logger.info(
+        f"Extracting PDF in parallel::pages={page_count}::chunks={len(chunks)}")
+
+    return [future.result() for future in futures]
+
+
+def extract_pdf_text(source: Union[str, BinaryIO], parallel: Optional[bool] = None) -> str:
+    return ''.join(_run_extraction(_extract_pages, source, parallel))
+
+
+def extract_pdf_text_with_layout(source: Union[str, BinaryIO],
+                                 parallel: Optional[bool] = None) -> Tuple[str, Dict[str, str]]:
+    results = _run_extraction(_extract_pages_with_layout, source, parallel)
+    return (''.join(text for text, _ in results),
+            classify_layout(layout for _, layouts in results for layout in layouts))
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
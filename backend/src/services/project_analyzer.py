@@ -1,67 +1,38 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from .base_analyzer import BaseAnalyzer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+from .header_classifier import HeaderClassifier
+from .line_embedding_index import LineEmbeddingIndex
 
 
-class ProjectAnalyzer(BaseAnalyzer):
+PROJECT_HEADERS = [
+    "Projects", "Key Projects", "Notable Projects", "Personal Projects",
+    "Academic Projects", "Professional Projects", "Project Experience",
+    "Selected Projects", "Recent Projects", "Portfolio", "Project Portfolio",
+    "Accomplishments", "Major Projects", "Relevant Projects", "Featured Projects",
+    "Project Work", "Project Highlights", "Significant Projects", "Project Summary",
+    "Technical Projects", "Side Projects", "Open Source Projects", "Research Projects"
+]
 
-    def __init__(self, sentence_model):
-        super().__init__(sentence_model)
-        self.project_headers = [
-            "Projects", "Key Projects", "Notable Projects", "Personal Projects",
-            "Academic Projects", "Professional Projects", "Project Experience",
-            "Selected Projects", "Recent Projects", "Portfolio", "Project Portfolio",
-            "Accomplishments", "Major Projects", "Relevant Projects", "Featured Projects",
-            "Project Work", "Project Highlights", "Significant Projects", "Project Summary",
-            "Technical Projects", "Side Projects", "Open Source Projects", "Research Projects"
-        ]
 
-        self.separators = [',', ';', '|', '•', '●', '▪', '/',
-                           '\\', '&', ':', ":-", "--", "-", "-->", "->"]
+class ProjectAnalyzer(BaseAnalyzer):
 
-    def is_project_header(self, line: str) -> bool:
-        return self._is_section_header(line, "projects", self.project_headers)
+    def __init__(self, sentence_model, header_classifier: Optional[HeaderClassifier] = None):
+        super().__init__(sentence_model, header_classifier)
+        self.project_headers = PROJECT_HEADERS
+        self.header_classifier.register("projects", self.project_headers)
 
-    def extract_projects_from_text(self, text: str) -> List[Dict[str, Any]]:
-        project_sections = self._find_project_sections(text)
+    def is_project_header(self, line: str, line_index: Optional[LineEmbeddingIndex] = None) -> bool:
+        return self._is_section_header(line, "projects", self.project_headers,
+                                       line_index=line_index)
 
+    def extract_projects_from_sections(self, section_texts: List[str]) -> List[Dict[str, Any]]:
         all_projects = []
-        for section_text in project_sections:
+        for section_text in section_texts:
             projects = self._parse_project_entries(section_text)
             all_projects.extend(projects)
 
         return all_projects
 
-    def _find_project_sections(self, text: str) -> List[str]:
-        lines = text.split('\n')
-        project_sections = []
-        project_embeddings = self._get_section_embeddings(
-            "projects", self.project_headers)
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-
-            line_embedding = self.sentence_model.encode([line])
-            similarities = cosine_similarity(
-                line_embedding, project_embeddings)
-            max_similarity = similarities.max()
-
-            if max_similarity > 0.6:
-                section_content = self._extract_general_section_content(
-                    lines, i, [self.is_project_header])
-                if section_content:
-                    project_sections.append(section_content)
-                i += len(section_content.split('\n'))
-            else:
-                i += 1
-
-        return project_sections
-
     def _parse_project_entries(self, section_text: str) -> List[Dict[str, Any]]:
         if not section_text.strip():
             return []
@@ -152,32 +123,3 @@ class ProjectAnalyzer(BaseAnalyzer):
             i += 1
 
         return projects
-
-    def _extract_skills_from_line(self, line: str) -> List[str]:
-        if not line:
-            return []
-
-        skills = []
-
-        bullet_patterns = [r'[•●▪▫◦‣⁃]', r'^\s*[-*+]\s+', r'^\s*\d+\.\s+']
-        for pattern in bullet_patterns:
-            line = re.sub(pattern, '', line).strip()
-
-        current_skills = [line]
-
-        for sep in self.separators:
-            new_skills = []
-            for skill in current_skills:
-                new_skills.extend([s.strip()
-                                  for s in skill.split(sep) if s.strip()])
-            current_skills = new_skills
-
-        for skill in current_skills:
-            skill = re.sub(r'\([^)]*\)', '', skill).strip()
-            skill = re.sub(r'\d+(\.\d+)*', '', skill).strip()
-            skill = skill.strip('.,;:')
-
-            if len(skill) > 1 and not skill.isdigit() and skill.lower() not in ['etc', 'and', 'or']:
-                skills.append(skill)
-
-        return list(set(skills))
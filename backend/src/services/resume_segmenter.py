@@ -0,0 +1,75 @@
+from typing import Callable, List, Optional
+
+
+class SectionSpan:
+
+    def __init__(self, section_type: str, header: str, start_idx: int):
+        self.section_type = section_type
+        self.header = header
+        self.start_idx = start_idx
+        self.end_idx = start_idx
+        self.lines: List[str] = []
+        self.sub_sections: List["SectionSpan"] = []
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    def __repr__(self) -> str:
+        return f"SectionSpan({self.section_type!r}, lines={self.start_idx}-{self.end_idx})"
+
+
+def segment_resume(
+    lines: List[str],
+    detect_section: Callable[[str], Optional[str]],
+    detect_sub_section: Optional[Callable[[str], Optional[str]]] = None,
+    sub_section_types: tuple = ("skills",),
+    max_blank_run: int = 2
+) -> List[SectionSpan]:
+    spans: List[SectionSpan] = []
+    current: Optional[SectionSpan] = None
+    current_sub: Optional[SectionSpan] = None
+    blank_run = 0
+
+    for idx, raw_line in enumerate(lines):
+        line = raw_line.strip()
+
+        if not line:
+            blank_run += 1
+            if current is not None and blank_run > max_blank_run:
+                current = None
+                current_sub = None
+            continue
+        blank_run = 0
+
+        section_type = detect_section(line)
+        is_nested_header = (
+            section_type is not None and current is not None
+            and section_type == current.section_type
+            and detect_sub_section is not None
+            and section_type in sub_section_types
+        )
+        if section_type and not (is_nested_header and detect_sub_section(line)):
+            current = SectionSpan(section_type, line, idx)
+            current_sub = None
+            spans.append(current)
+            continue
+
+        if current is None:
+            continue
+
+        current.lines.append(line)
+        current.end_idx = idx
+
+        if detect_sub_section is None or current.section_type not in sub_section_types:
+            continue
+
+        sub_type = detect_sub_section(line)
+        if sub_type:
+            current_sub = SectionSpan(sub_type, line, idx)
+            current.sub_sections.append(current_sub)
+        elif current_sub is not None:
+            current_sub.lines.append(line)
+            current_sub.end_idx = idx
+
+    return spans
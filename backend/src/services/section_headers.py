@@ -0,0 +1,13 @@
+SECTION_HEADERS = {
+    'professional_summary': ['summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me', 'professional profile', 'career summary'],
+    'experience': ['experience', 'work experience', 'employment', 'professional experience', 'work history', 'career history', 'employment history', 'work', 'career experience'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'competencies', 'expertise', 'technical expertise', 'core skills', 'key skills', 'areas of expertise'],
+    'education': ['education', 'academic background', 'qualifications', 'academic qualifications', 'educational background', 'academic history'],
+    'projects': ['projects', 'key projects', 'project experience', 'professional projects', 'notable projects', 'project work', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'professional certifications', 'credentials', 'professional credentials'],
+    'achievements': ['achievements', 'accomplishments', 'awards', 'honors', 'recognition', 'notable achievements']
+}
+
+# Ordinary words that are only headers when styled as one (heading layout, ALL CAPS or a trailing colon)
+LOOSE_SECTION_HEADERS = {'work', 'portfolio', 'expertise', 'profile', 'recognition', 'credentials'}
+LOOSE_HEADER_CONFIDENCE = 0.5
@@ -0,0 +1,57 @@
+import re
+from typing import Callable, List, Optional
+
+SKILL_SEPARATORS = [',', ';', '|', '•', '●', '▪', '/',
+                    '\\', '&', ':', ":-", "--", "-", "-->", "->"]
+
+SKILL_STOPWORDS = frozenset(['etc', 'and', 'or'])
+
+SEPARATOR_PATTERN = re.compile('|'.join(
+    re.escape(sep) for sep in sorted(SKILL_SEPARATORS, key=len, reverse=True)))
+BULLET_PATTERN = re.compile(r'[•●▪▫◦‣⁃]')
+LEADING_MARKER_PATTERN = re.compile(r'^(?:\s*(?:[-*+]|\d+\.)\s+)+')
+PARENTHESES_PATTERN = re.compile(r'\([^)]*\)')
+VERSION_PATTERN = re.compile(r'\d+(\.\d+)*')
+
+
+def _clean_token(token: str) -> Optional[str]:
+    token = PARENTHESES_PATTERN.sub('', token).strip()
+    token = VERSION_PATTERN.sub('', token).strip()
+    token = token.strip('.,;:')
+
+    if len(token) > 1 and token.lower() not in SKILL_STOPWORDS:
+        return token
+    return None
+
+
+def _line_tokens(line: str) -> List[str]:
+    line = BULLET_PATTERN.sub('', line).strip()
+    line = LEADING_MARKER_PATTERN.sub('', line).strip()
+
+    tokens = []
+    for token in SEPARATOR_PATTERN.split(line):
+        token = _clean_token(token.strip())
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+def extract_skill_tokens(line: str) -> List[str]:
+    if not line:
+        return []
+    return list(dict.fromkeys(_line_tokens(line)))
+
+
+def extract_skill_tokens_from_text(text: str,
+                                   skip_line: Optional[Callable[[str], bool]] = None) -> List[str]:
+    if not text:
+        return []
+
+    tokens = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line or (skip_line is not None and skip_line(line)):
+            continue
+        tokens.extend(_line_tokens(line))
+
+    return list(dict.fromkeys(tokens))
@@ -1,18 +1,117 @@
 import chromadb
-from typing import Dict, List, Any, Optional
+import hashlib
+import logging
+from typing import Collection, Dict, List, Any, Optional, Tuple
 from sentence_transformers import SentenceTransformer
-import uuid
 import re
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 from .work_experience_analyzer import WorkExperienceAnalyzer
 from .summary_analyzer import SummaryAnalyzer
 from .project_analyzer import ProjectAnalyzer
 from .base_analyzer import BaseAnalyzer
+from .section_headers import SECTION_HEADERS
+from .header_classifier import normalize_rows
+from .keyword_automaton import KeywordAutomaton
+from .line_embedding_index import LineEmbeddingIndex
+from .resume_segmenter import SectionSpan, segment_resume
+from .skill_tokenizer import extract_skill_tokens, extract_skill_tokens_from_text
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+PARSE_OUTPUTS = ("sections", "skills", "experience",
+                 "projects", "professional_summary")
+
+SKILL_HEADERS = [
+    "Technical Skills", "Skills", "Core Skills", "Programming Skills",
+    "Technical Expertise", "Technologies", "Technical Competencies",
+    "Programming Languages", "Languages & Technologies", "Tools & Technologies",
+    "Software Skills", "Computer Skills", "IT Skills", "Tech Stack",
+    "Technical Proficiencies", "Technology Stack", "Core Competencies"
+]
+
+SKILL_SUB_HEADERS = {
+    "programming_languages": [
+        "Programming Languages", "Languages", "Coding Languages",
+        "Development Languages", "Programming", "Languages & Frameworks",
+        "Programming Technologies", "Coding", "Languages Used"
+    ],
+    "web_technologies": [
+        "Web Technologies", "Web Development", "Frontend", "Backend",
+        "Web Frameworks", "Web Tools", "Web Stack", "Frontend Technologies",
+        "Backend Technologies", "Web Development Tools", "UI/UX Technologies"
+    ],
+    "databases": [
+        "Databases", "Database Technologies", "Data Storage",
+        "Database Management", "DB Technologies", "Data Management",
+        "Database Systems", "Database Tools"
+    ],
+    "devops": [
+        "DevOps", "Cloud Technologies", "Infrastructure",
+        "Deployment", "Cloud Platforms", "DevOps Tools",
+        "Cloud Services", "Infrastructure Tools", "Deployment Tools",
+        "Cloud Computing", "Platform Technologies"
+    ],
+    "data_science": [
+        "Data Science", "Machine Learning", "AI/ML", "Analytics",
+        "Data Analysis", "ML Frameworks", "Artificial Intelligence",
+        "Data Technologies", "ML Tools", "AI Technologies"
+    ],
+    "version_control": [
+        "Version Control", "Source Control", "Git", "VCS",
+        "Version Management", "Source Code Management"
+    ],
+    "testing": [
+        "Testing", "Quality Assurance", "QA", "Test Frameworks",
+        "Testing Tools", "Testing Technologies", "Quality Control"
+    ],
+    "development_tools": [
+        "Development Tools", "IDEs", "Tools", "Development Environment",
+        "Integrated Development Environment", "Code Editors", "Development Software"
+    ]
+}
+
+SKILL_PATTERNS = {
+    "programming_languages": [
+        "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust",
+        "PHP", "Ruby", "Swift", "Kotlin", "Scala", "HTML", "CSS", "SQL", "PL/SQL"
+    ],
+    "web_technologies": [
+        "HTML", "CSS", "React", "React.js", "Next.js", "Next JS", "Vue.js", "Angular",
+        "Node.js", "NodeJS", "Express.js", "FastAPI", "Django", "Flask", "REST",
+        "RESTful", "GraphQL", "Tailwind CSS", "Bootstrap", "SOAP", "HTML5", "CSS3"
+    ],
+    "databases": [
+        "PostgreSQL", "MySQL", "MongoDB", "Mongo DB", "Redis", "Elasticsearch",
+        "SQLite", "Oracle", "Cassandra", "DynamoDB", "SQL", "NoSQL", "Database Design"
+    ],
+    "devops": [
+        "AWS", "Azure", "Google Cloud", "GCP", "Docker", "Kubernetes",
+        "CI/CD", "DevOps", "Terraform", "Jenkins", "AWS Lambda",
+        "AWS S3", "Grafana", "Prometheus", "Ansible", "Nginx"
+    ],
+    "data_science": [
+        "Pandas", "NumPy", "TensorFlow", "PyTorch", "Scikit-learn",
+        "Machine Learning", "Deep Learning", "NLP", "Computer Vision"
+    ],
+    "version_control": [
+        "Git", "GitHub", "GitLab", "Bitbucket", "SVN", "Mercurial"
+    ],
+    "testing": [
+        "Unit Testing", "Integration Testing", "End-to-End Testing", "Selenium", "JUnit", "PyTest"
+    ],
+    "development_tools": [
+        "IntelliJ", "Cursor", "Visual Studio", "VSCode", "PyCharm", "Eclipse",
+        "Sublime Text", "Atom", "Vim", "Emacs", "Jupyter", "Postman"
+    ],
+}
 
 
 class VectorSkillsAnalyzer(BaseAnalyzer):
-    def __init__(self, sentence_model: SentenceTransformer):
+    def __init__(self, sentence_model: SentenceTransformer, model_name: str = "",
+                 seed_database: bool = True):
         super().__init__(sentence_model)
+        self.model_name = model_name
         self.client = chromadb.PersistentClient(
             path="chroma_db",
             settings=chromadb.config.Settings(
@@ -26,161 +125,189 @@ class VectorSkillsAnalyzer(BaseAnalyzer):
             metadata={"hnsw:space": "cosine"}
         )
 
-        self.experience_analyzer = WorkExperienceAnalyzer(sentence_model)
-        self.summary_analyzer = SummaryAnalyzer(sentence_model)
-        self.project_analyzer = ProjectAnalyzer(sentence_model)
-
-        self.skills_headers = [
-            "Technical Skills", "Skills", "Core Skills", "Programming Skills",
-            "Technical Expertise", "Technologies", "Technical Competencies",
-            "Programming Languages", "Languages & Technologies", "Tools & Technologies",
-            "Software Skills", "Computer Skills", "IT Skills", "Tech Stack",
-            "Technical Proficiencies", "Technology Stack", "Core Competencies"
-        ]
-
-        self.skill_sub_headers = {
-            "programming_languages": [
-                "Programming Languages", "Languages", "Coding Languages",
-                "Development Languages", "Programming", "Languages & Frameworks",
-                "Programming Technologies", "Coding", "Languages Used"
-            ],
-            "web_technologies": [
-                "Web Technologies", "Web Development", "Frontend", "Backend",
-                "Web Frameworks", "Web Tools", "Web Stack", "Frontend Technologies",
-                "Backend Technologies", "Web Development Tools", "UI/UX Technologies"
-            ],
-            "databases": [
-                "Databases", "Database Technologies", "Data Storage",
-                "Database Management", "DB Technologies", "Data Management",
-                "Database Systems", "Database Tools"
-            ],
-            "devops": [
-                "DevOps", "Cloud Technologies", "Infrastructure",
-                "Deployment", "Cloud Platforms", "DevOps Tools",
-                "Cloud Services", "Infrastructure Tools", "Deployment Tools",
-                "Cloud Computing", "Platform Technologies"
-            ],
-            "data_science": [
-                "Data Science", "Machine Learning", "AI/ML", "Analytics",
-                "Data Analysis", "ML Frameworks", "Artificial Intelligence",
-                "Data Technologies", "ML Tools", "AI Technologies"
-            ],
-            "version_control": [
-                "Version Control", "Source Control", "Git", "VCS",
-                "Version Management", "Source Code Management"
-            ],
-            "testing": [
-                "Testing", "Quality Assurance", "QA", "Test Frameworks",
-                "Testing Tools", "Testing Technologies", "Quality Control"
-            ],
-            "development_tools": [
-                "Development Tools", "IDEs", "Tools", "Development Environment",
-                "Integrated Development Environment", "Code Editors", "Development Software"
-            ]
-        }
-
-        self.separators = [',', ';', '|', '•', '●', '▪', '/',
-                           '\\', '&', ':', ":-", "--", "-", "-->", "->"]
-
-        self._compute_skill_embeddings()
-        self._compute_sub_skill_embeddings()
-
-        self.initialize_skill_database()
-
-    def _compute_skill_embeddings(self):
-        self.embeddings_cache["skills"] = self.sentence_model.encode(
-            self.skills_headers)
-
-    def _compute_sub_skill_embeddings(self):
+        self.experience_analyzer = WorkExperienceAnalyzer(
+            sentence_model, self.header_classifier)
+        self.summary_analyzer = SummaryAnalyzer(
+            sentence_model, self.header_classifier)
+        self.project_analyzer = ProjectAnalyzer(
+            sentence_model, self.header_classifier)
+
+        self.skills_headers = SKILL_HEADERS
+        self.skill_sub_headers = SKILL_SUB_HEADERS
+
+        self.section_types = ["skills", "experience",
+                              "projects", "professional_summary"]
+        self.sub_skill_labels = [
+            f"sub_{category}" for category in self.skill_sub_headers.keys()]
+
+        self._register_skill_headers()
+
+        self.skill_matcher: Optional[KeywordAutomaton] = None
+        self.skill_matcher_version: Optional[str] = None
+
+        self._prepare_taxonomy()
+        # CPU pool workers only read the taxonomy the serving process already seeded
+        if seed_database:
+            self.initialize_skill_database()
+        self._load_taxonomy_matrix()
+
+    def _register_skill_headers(self):
+        header_lists = {"skills": self.skills_headers}
         for category, headers in self.skill_sub_headers.items():
-            self.embeddings_cache[f"sub_{category}"] = self.sentence_model.encode(
-                headers)
+            header_lists[f"sub_{category}"] = headers
+        self.header_classifier.register_many(header_lists)
 
-    def _is_skill_header(self, line: str) -> bool:
-        return self._is_section_header(line, "skills", self.skills_headers)
+    def _clean_sub_skill_header(self, line: str) -> str:
+        clean_line = line.strip()
+        clean_line = re.sub(r'^[•●▪▫◦‣⁃\-\*\+\d+\.]\s*', '', clean_line)
+        return clean_line.rstrip(':').strip()
 
-    def _detect_sub_skill_header(self, line: str, threshold: float = 0.65) -> Optional[str]:
+    def _detect_sub_skill_header(self, line: str, threshold: float = 0.65,
+                                 line_index: Optional[LineEmbeddingIndex] = None) -> Optional[str]:
         if not line or len(line.split()) > 6 or len(line) > 40:
             return None
 
-        clean_line = line.strip()
-        clean_line = re.sub(r'^[•●▪▫◦‣⁃\-\*\+\d+\.]\s*', '', clean_line)
-        clean_line = clean_line.rstrip(':').strip()
+        clean_line = self._clean_sub_skill_header(line)
+
+        scores = self._header_scores(clean_line, line_index)
+        best_label, _ = self.header_classifier.best_label(
+            scores, self.sub_skill_labels, threshold)
 
-        line_embedding = self.sentence_model.encode([clean_line])
+        return best_label[len("sub_"):] if best_label else None
 
-        best_category = None
-        best_similarity = 0
+    @property
+    def _skill_id_prefix(self) -> str:
+        # The collection is shared by every embedding model, so ids are namespaced per model
+        return f"{hashlib.sha256(self.model_name.encode('utf-8')).hexdigest()[:16]}:"
 
-        for category in self.skill_sub_headers.keys():
-            sub_embeddings = self.embeddings_cache[f"sub_{category}"]
-            similarities = cosine_similarity(line_embedding, sub_embeddings)
-            max_similarity = similarities.max()
+    def _skill_id(self, category: str, skill: str) -> str:
+        digest = hashlib.sha256(f"{category}\0{skill}\0{self.model_name}".encode('utf-8')).hexdigest()
+        return f"{self._skill_id_prefix}{digest}"
 
-            if max_similarity > best_similarity and max_similarity > threshold:
-                best_similarity = max_similarity
-                best_category = category
+    def _taxonomy_entries(self) -> List[Tuple[str, str, str]]:
+        return [(self._skill_id(category, skill), category, skill)
+                for category, skills in self.skill_patterns.items()
+                for skill in skills]
 
-        return best_category
+    def _prepare_taxonomy(self):
+        self.skill_patterns = SKILL_PATTERNS
+        self.taxonomy_version = hashlib.sha256(
+            '\n'.join(sorted(entry_id for entry_id, _, _ in self._taxonomy_entries())).encode('utf-8')).hexdigest()
 
     def initialize_skill_database(self):
-        self.skill_patterns = {
-            "programming_languages": [
-                "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Rust",
-                "PHP", "Ruby", "Swift", "Kotlin", "Scala", "HTML", "CSS", "SQL", "PL/SQL"
-            ],
-            "web_technologies": [
-                "HTML", "CSS", "React", "React.js", "Next.js", "Next JS", "Vue.js", "Angular",
-                "Node.js", "NodeJS", "Express.js", "FastAPI", "Django", "Flask", "REST",
-                "RESTful", "GraphQL", "Tailwind CSS", "Bootstrap", "SOAP", "HTML5", "CSS3"
-            ],
-            "databases": [
-                "PostgreSQL", "MySQL", "MongoDB", "Mongo DB", "Redis", "Elasticsearch",
-                "SQLite", "Oracle", "Cassandra", "DynamoDB", "SQL", "NoSQL", "Database Design"
-            ],
-            "devops": [
-                "AWS", "Azure", "Google Cloud", "GCP", "Docker", "Kubernetes",
-                "CI/CD", "DevOps", "Terraform", "Jenkins", "AWS Lambda",
-                "AWS S3", "Grafana", "Prometheus", "Ansible", "Nginx"
-            ],
-            "data_science": [
-                "Pandas", "NumPy", "TensorFlow", "PyTorch", "Scikit-learn",
-                "Machine Learning", "Deep Learning", "NLP", "Computer Vision"
-            ],
-            "version_control": [
-                "Git", "GitHub", "GitLab", "Bitbucket", "SVN", "Mercurial"
-            ],
-            "testing": [
-                "Unit Testing", "Integration Testing", "End-to-End Testing", "Selenium", "JUnit", "PyTest"
-            ],
-            "development_tools": [
-                "IntelliJ", "Cursor", "Visual Studio", "VSCode", "PyCharm", "Eclipse",
-                "Sublime Text", "Atom", "Vim", "Emacs", "Jupyter", "Postman"
-            ],
-        }
-
-        for category, skills in self.skill_patterns.items():
-            embeddings = self.sentence_model.encode(skills)
-            ids = [str(uuid.uuid4()) for _ in skills]
-            metadatas = [{"category": category, "skill": skill}
-                         for skill in skills]
-
-            self.collection.add(
-                embeddings=embeddings.tolist(),
-                documents=skills,
-                metadatas=metadatas,
-                ids=ids
-            )
+        self._prepare_taxonomy()
+        entries = self._taxonomy_entries()
+
+        current = self.collection.get(
+            where={"taxonomy_version": self.taxonomy_version}, include=[])
+        if len(current["ids"]) == len(entries):
+            logger.info(
+                f"Skill taxonomy already seeded::{self.taxonomy_version[:12]}")
+            return
+
+        stored_ids = set(self.collection.get(
+            ids=[entry_id for entry_id, _, _ in entries], include=[])["ids"])
+        metadatas = {entry_id: {"category": category, "skill": skill, "model": self.model_name,
+                                "taxonomy_version": self.taxonomy_version}
+                     for entry_id, category, skill in entries}
+
+        stale = [entry_id for entry_id, _, _ in entries if entry_id in stored_ids]
+        if stale:
+            self.collection.update(
+                ids=stale, metadatas=[metadatas[entry_id] for entry_id in stale])
+
+        missing = [entry for entry in entries if entry[0] not in stored_ids]
+        self._store_skill_embeddings(missing)
+
+        removed = self.compact_skill_database()
+        logger.info(
+            f"Seeded skill taxonomy::{self.taxonomy_version[:12]}::encoded={len(missing)}::removed={removed}")
+
+    def _store_skill_embeddings(self, entries: List[Tuple[str, str, str]]) -> Dict[str, List[float]]:
+        if not entries:
+            return {}
 
-    def extract_skills_from_text(self, text: str, threshold: float = 0.7) -> Dict[str, List[str]]:
+        embeddings = np.asarray(self.sentence_model.encode(
+            [skill for _, _, skill in entries])).tolist()
+        self.collection.upsert(
+            ids=[entry_id for entry_id, _, _ in entries],
+            embeddings=embeddings,
+            documents=[skill for _, _, skill in entries],
+            metadatas=[{"category": category, "skill": skill, "model": self.model_name,
+                        "taxonomy_version": self.taxonomy_version}
+                       for _, category, skill in entries]
+        )
+        return {entry_id: embedding for (entry_id, _, _), embedding in zip(entries, embeddings)}
+
+    def _load_taxonomy_matrix(self):
+        entries = self._taxonomy_entries()
+        stored = self.collection.get(
+            ids=[entry_id for entry_id, _, _ in entries], include=["embeddings"])
+        embeddings_by_id = dict(zip(stored["ids"], stored["embeddings"]))
+
+        missing = [entry for entry in entries if entry[0] not in embeddings_by_id]
+        if missing:
+            logger.warning(
+                f"Skill taxonomy embeddings missing::{len(missing)}::re-embedding")
+            embeddings_by_id.update(self._store_skill_embeddings(missing))
+
+        self.taxonomy_entries = [(category, skill)
+                                 for _, category, skill in entries]
+        self.taxonomy_matrix = normalize_rows(
+            [embeddings_by_id[entry_id] for entry_id, _, _ in entries])
+
+    def _get_skill_matcher(self) -> KeywordAutomaton:
+        if self.skill_matcher is None or self.skill_matcher_version != self.taxonomy_version:
+            keywords: Dict[str, set] = {}
+            for category, patterns in self.skill_patterns.items():
+                for pattern in patterns:
+                    pattern_variations = [
+                        pattern,
+                        pattern.replace('.', ''),
+                        pattern.replace(' ', ''),
+                        pattern.replace('-', ''),
+                    ]
+                    for variation in pattern_variations:
+                        keywords.setdefault(variation.lower(), set()).add(
+                            (category, pattern))
+
+            self.skill_matcher = KeywordAutomaton(keywords)
+            self.skill_matcher_version = self.taxonomy_version
+            logger.info(
+                f"Built skill matcher::{self.taxonomy_version[:12]}::keywords={len(self.skill_matcher)}")
+
+        return self.skill_matcher
+
+    def compact_skill_database(self, batch_size: int = 500) -> int:
+        valid_ids = {entry_id for entry_id, _, _ in self._taxonomy_entries()}
+        # This model's entries (prefixed ids or "model" metadata) and legacy rows without a "model" key,
+        # such as the uuid-keyed duplicates from before the taxonomy was versioned
+        stored = self.collection.get(include=["metadatas"])
+        owned_ids = {entry_id for entry_id, metadata in zip(stored["ids"], stored["metadatas"])
+                     if entry_id.startswith(self._skill_id_prefix)
+                     or (metadata or {}).get("model", self.model_name) == self.model_name}
+        obsolete = sorted(owned_ids - valid_ids)
+
+        for start in range(0, len(obsolete), batch_size):
+            self.collection.delete(ids=obsolete[start:start + batch_size])
+
+        return len(obsolete)
+
+    def extract_skills_from_text(self, text: str, threshold: float = 0.7,
+                                 line_index: Optional[LineEmbeddingIndex] = None) -> Dict[str, List[str]]:
+        spans = self.segment_resume(text, line_index)
+        return self.extract_skills_from_spans(spans, text, threshold, line_index)
+
+    def extract_skills_from_spans(self, spans: List[SectionSpan], text: str, threshold: float = 0.7,
+                                  line_index: Optional[LineEmbeddingIndex] = None) -> Dict[str, List[str]]:
         categorized_skills = {category: []
                               for category in self.skill_patterns.keys()}
 
-        skill_sections = self._find_skill_sections(text)
+        for span in spans:
+            if span.section_type != "skills":
+                continue
 
-        for section_text in skill_sections:
-            sub_header_skills = self._extract_skills_with_sub_headers(
-                section_text)
+            sub_header_skills = self._extract_skills_with_sub_headers(span)
 
             for category, skills in sub_header_skills.items():
                 if category in categorized_skills:
@@ -188,7 +315,7 @@ class VectorSkillsAnalyzer(BaseAnalyzer):
 
             if not sub_header_skills:
                 extracted_skills = self._extract_skills_from_section(
-                    section_text)
+                    span.text, line_index)
                 vector_categorized = self._categorize_skills(
                     extracted_skills, threshold)
 
@@ -197,30 +324,19 @@ class VectorSkillsAnalyzer(BaseAnalyzer):
                         categorized_skills[category].extend(skills)
 
         if not any(categorized_skills.values()):
-            all_skills = self._extract_skills_from_section(text)
+            all_skills = self._extract_skills_from_section(text, line_index)
             vector_categorized = self._categorize_skills(all_skills, threshold)
 
             for category, skills in vector_categorized.items():
                 if category in categorized_skills:
                     categorized_skills[category].extend(skills)
 
-        text_lower = text.lower()
+        matched_patterns = self._get_skill_matcher().match_values(text)
 
         for category, patterns in self.skill_patterns.items():
             for pattern in patterns:
-                pattern_variations = [
-                    pattern,
-                    pattern.lower(),
-                    pattern.replace('.', ''),
-                    pattern.replace(' ', ''),
-                    pattern.replace('-', ''),
-                ]
-
-                for variation in pattern_variations:
-                    if variation.lower() in text_lower:
-                        if pattern not in categorized_skills[category]:
-                            categorized_skills[category].append(pattern)
-                        break
+                if (category, pattern) in matched_patterns and pattern not in categorized_skills[category]:
+                    categorized_skills[category].append(pattern)
 
         for category in list(categorized_skills.keys()):
             seen = set()
@@ -237,247 +353,176 @@ class VectorSkillsAnalyzer(BaseAnalyzer):
 
         return categorized_skills
 
-    def _extract_skills_with_sub_headers(self, section_text: str) -> Dict[str, List[str]]:
-        if not section_text:
-            return {}
-
-        lines = section_text.split('\n')
+    def _extract_skills_with_sub_headers(self, span: SectionSpan) -> Dict[str, List[str]]:
         categorized_skills = {}
-        current_category = None
-        current_skills = []
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for sub_section in span.sub_sections:
+            current_skills = []
+            for line in sub_section.lines:
+                current_skills.extend(self._extract_skills_from_line(line))
 
-            if (self.experience_analyzer.is_experience_header(line) or
-                self.project_analyzer.is_project_header(line) or
-                    self.summary_analyzer.is_professional_summary_header(line)):
-                break
-
-            detected_category = self._detect_sub_skill_header(line)
-
-            if detected_category:
-                if current_category and current_skills:
-                    if current_category not in categorized_skills:
-                        categorized_skills[current_category] = []
-                    categorized_skills[current_category].extend(current_skills)
-
-                current_category = detected_category
-                current_skills = []
-            else:
-                line_skills = self._extract_skills_from_line(line)
-                current_skills.extend(line_skills)
-
-        if current_category and current_skills:
-            if current_category not in categorized_skills:
-                categorized_skills[current_category] = []
-            categorized_skills[current_category].extend(current_skills)
+            if current_skills:
+                categorized_skills.setdefault(
+                    sub_section.section_type, []).extend(current_skills)
 
         return categorized_skills
 
     def _extract_skills_from_line(self, line: str) -> List[str]:
-        if not line:
-            return []
-
-        skills = []
-
-        bullet_patterns = [r'[•●▪▫◦‣⁃]', r'^\s*[-*+]\s+', r'^\s*\d+\.\s+']
-        for pattern in bullet_patterns:
-            line = re.sub(pattern, '', line).strip()
-
-        current_skills = [line]
-
-        for sep in self.separators:
-            new_skills = []
-            for skill in current_skills:
-                new_skills.extend([s.strip()
-                                  for s in skill.split(sep) if s.strip()])
-            current_skills = new_skills
-
-        for skill in current_skills:
-            skill = re.sub(r'\([^)]*\)', '', skill).strip()
-            skill = re.sub(r'\d+(\.\d+)*', '', skill).strip()
-            skill = skill.strip('.,;:')
-
-            if len(skill) > 1 and not skill.isdigit() and skill.lower() not in ['etc', 'and', 'or']:
-                skills.append(skill)
+        return extract_skill_tokens(line)
+
+    def _extract_skills_from_section(self, section_text: str,
+                                     line_index: Optional[LineEmbeddingIndex] = None) -> List[str]:
+        return extract_skill_tokens_from_text(
+            section_text,
+            skip_line=lambda line: self._detect_sub_skill_header(
+                line, line_index=line_index) is not None
+        )
 
-        return list(set(skills))
+    def _categorize_skills(self, skills: List[str], threshold: float) -> Dict[str, List[str]]:
+        if not skills:
+            return {}
 
-    def _find_skill_sections(self, text: str) -> List[str]:
-        lines = text.split('\n')
-        skill_sections = []
-        header_embeddings = self.embeddings_cache["skills"]
+        if settings.SKILL_CATEGORIZER_BACKEND == "chroma":
+            return self._categorize_skills_with_chroma(skills, threshold)
 
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
+        similarities = normalize_rows(
+            self.sentence_model.encode(skills)) @ self.taxonomy_matrix.T
+        best_matches = similarities.argmax(axis=1)
+        best_scores = similarities[np.arange(len(skills)), best_matches]
 
-            line_embedding = self.sentence_model.encode([line])
+        matches = [self.taxonomy_entries[match] if score > threshold else None
+                   for match, score in zip(best_matches, best_scores)]
+        return self._group_skill_matches(matches)
 
-            similarities = cosine_similarity(line_embedding, header_embeddings)
-            max_similarity = similarities.max()
+    def _categorize_skills_with_chroma(self, skills: List[str], threshold: float) -> Dict[str, List[str]]:
+        results = self.collection.query(
+            query_embeddings=self.sentence_model.encode(skills).tolist(),
+            n_results=1,
+            include=["metadatas", "documents", "distances"]
+        )
 
-            if max_similarity > 0.6:  # Threshold for header similarity
-                section_content = self._extract_section_content(lines, i)
-                if section_content:
-                    skill_sections.append(section_content)
-                i += len(section_content.split('\n'))
+        matches = []
+        for distances, metadatas, documents in zip(results['distances'], results['metadatas'], results['documents']):
+            if distances and distances[0] < (1 - threshold):
+                matches.append((metadatas[0]['category'], documents[0]))
             else:
-                i += 1
-
-        return skill_sections
+                matches.append(None)
+        return self._group_skill_matches(matches)
 
-    def _extract_section_content(self, lines: List[str], start_idx: int) -> str:
-        content_lines = []
-        i = start_idx + 1
-
-        while i < len(lines):
-            line = lines[i].strip()
-
-            if self._is_skill_header(line):
-                break
-
-            if not line:
-                empty_count = 0
-                j = i
-                while j < len(lines) and not lines[j].strip():
-                    empty_count += 1
-                    j += 1
-                if empty_count > 2:
-                    break
-
-            content_lines.append(line)
-            i += 1
-
-        return '\n'.join(content_lines).strip()
-
-    def _extract_skills_from_section(self, section_text: str) -> List[str]:
-        if not section_text:
-            return []
-
-        potential_skills = []
-
-        bullet_patterns = [r'[•●▪▫◦‣⁃]', r'^\s*[-*+]\s+', r'^\s*\d+\.\s+']
-        lines = section_text.split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            if self._detect_sub_skill_header(line):
-                continue
-
-            for pattern in bullet_patterns:
-                line = re.sub(pattern, '', line).strip()
-
-            skills = [line]
-
-            for sep in self.separators:
-                new_skills = []
-                for skill in skills:
-                    new_skills.extend([s.strip()
-                                      for s in skill.split(sep) if s.strip()])
-                skills = new_skills
-
-            for skill in skills:
-                skill = re.sub(r'\([^)]*\)', '', skill).strip()
-                skill = re.sub(r'\d+(\.\d+)*', '', skill).strip()
-                skill = skill.strip('.,;:')
-
-                if len(skill) > 1 and not skill.isdigit():
-                    potential_skills.append(skill)
-
-        return list(set(potential_skills))
-
-    def _categorize_skills(self, skills: List[str], threshold: float) -> Dict[str, List[str]]:
+    def _group_skill_matches(self, matches: List[Optional[Tuple[str, str]]]) -> Dict[str, List[str]]:
         categorized_skills = {}
 
-        for skill in skills:
-            query_embedding = self.sentence_model.encode([skill])[0].tolist()
-
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=3,
-                include=["metadatas", "documents", "distances"]
-            )
-
-            if results['distances'][0] and results['distances'][0][0] < (1 - threshold):
-                category = results['metadatas'][0][0]['category']
-                matched_skill = results['documents'][0][0]
+        for match in matches:
+            if match is None:
+                continue
 
-                if category not in categorized_skills:
-                    categorized_skills[category] = []
+            category, matched_skill = match
+            if category not in categorized_skills:
+                categorized_skills[category] = []
 
-                if matched_skill not in categorized_skills[category]:
-                    categorized_skills[category].append(matched_skill)
+            if matched_skill not in categorized_skills[category]:
+                categorized_skills[category].append(matched_skill)
 
         return categorized_skills
 
-    def detect_all_sections(self, text: str) -> Dict[str, str]:
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        sections = {}
-        current_section = None
-        current_content = []
+    def _detect_section(self, line: str, line_index: Optional[LineEmbeddingIndex] = None,
+                        threshold: float = 0.6) -> Optional[str]:
+        if not self._passes_header_gate(line):
+            return None
 
-        for line in lines:
-            detected_section = None
+        scores = self._header_scores(line, line_index)
+        for section_type in self.section_types:
+            if scores[self.header_classifier.label_positions[section_type]] > threshold:
+                return section_type
 
-            if self._is_skill_header(line):
-                detected_section = "skills"
-            elif self.experience_analyzer.is_experience_header(line):
-                detected_section = "experience"
-            elif self.project_analyzer.is_project_header(line):
-                detected_section = "projects"
-            elif self.summary_analyzer.is_professional_summary_header(line):
-                detected_section = "professional_summary"
+        return None
 
-            if detected_section:
-                if current_section and current_content:
-                    sections[current_section] = '\n'.join(current_content)
+    def _classify_section_line(self, line: str, line_index: Optional[LineEmbeddingIndex] = None) -> Optional[str]:
+        section_type = self._detect_section(line, line_index)
+        if section_type:
+            return section_type
 
-                current_section = detected_section
-                current_content = []
-            elif current_section:
-                current_content.append(line)
+        layout_hint = line_index.layout_hints.get(line) if line_index is not None else None
+        labels, confidence = self._lexicon_match(line, layout_hint)
+        if confidence < 1.0:
+            return None
+        other_sections = sorted(
+            labels.intersection(SECTION_HEADERS) - set(self.section_types))
+        return other_sections[0] if other_sections else None
+
+    def segment_resume(self, text: str, line_index: Optional[LineEmbeddingIndex] = None) -> List[SectionSpan]:
+        return segment_resume(
+            text.split('\n'),
+            lambda line: self._classify_section_line(line, line_index),
+            lambda line: self._detect_sub_skill_header(
+                line, line_index=line_index)
+        )
 
-        if current_section and current_content:
-            sections[current_section] = '\n'.join(current_content)
+    def _span_texts(self, spans: List[SectionSpan], section_type: str) -> List[str]:
+        return [span.text for span in spans if span.section_type == section_type and span.lines]
 
+    def _sections_from_spans(self, spans: List[SectionSpan]) -> Dict[str, str]:
+        sections = {}
+        for span in spans:
+            if span.section_type in self.section_types and span.lines:
+                sections[span.section_type] = span.text
         return sections
 
-    def extract_experience_from_text(self, text: str) -> List[Dict[str, Any]]:
-        return self.experience_analyzer.extract_experience_from_text(text)
-
-    def extract_projects_from_text(self, text: str) -> List[Dict[str, Any]]:
-        return self.project_analyzer.extract_projects_from_text(text)
-
-    def extract_professional_summary_from_text(self, text: str) -> str:
-        return self.summary_analyzer.extract_professional_summary_from_text(text)
-
-    def parse_complete_resume(self, text: str) -> Dict[str, Any]:
-        sections = self.detect_all_sections(text)
-
-        skills = self.extract_skills_from_text(text)
-        experience = self.extract_experience_from_text(text)
-        projects = self.extract_projects_from_text(text)
-        professional_summary = self.extract_professional_summary_from_text(
-            text)
-
-        return {
-            "sections": sections,
-            "skills": skills,
-            "experience": experience,
-            "projects": projects,
-            "professional_summary": professional_summary,
-            "raw_text": text
-        }
+    def detect_all_sections(self, text: str,
+                            line_index: Optional[LineEmbeddingIndex] = None) -> Dict[str, str]:
+        return self._sections_from_spans(self.segment_resume(text, line_index))
+
+    def build_line_index(self, text: str,
+                         layout_hints: Optional[Dict[str, str]] = None) -> LineEmbeddingIndex:
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        sub_header_candidates = [self._clean_sub_skill_header(line) for line in lines
+                                 if len(line.split()) <= 6 and len(line) <= 40]
+
+        if layout_hints:
+            layout_hints = dict(layout_hints)
+            for line in lines:
+                clean_line = self._clean_sub_skill_header(line)
+                if line in layout_hints and clean_line not in layout_hints:
+                    layout_hints[clean_line] = layout_hints[line]
+
+        return self._build_line_index(lines + sub_header_candidates, layout_hints)
+
+    def parse_complete_resume(self, text: str, outputs: Optional[Collection[str]] = None,
+                              layout_hints: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        outputs = set(PARSE_OUTPUTS if outputs is None else outputs)
+        unknown = outputs.difference(PARSE_OUTPUTS)
+        if unknown:
+            raise ValueError(
+                f"Unsupported parse outputs: {sorted(unknown)}. Allowed: {PARSE_OUTPUTS}")
+
+        parsed: Dict[str, Any] = {}
+        if not outputs:
+            parsed["raw_text"] = text
+            return parsed
+
+        line_index = self.build_line_index(text, layout_hints)
+        logger.info(
+            f"Header detection stages::{dict(line_index.stage_counts)}")
+
+        spans = self.segment_resume(text, line_index)
+
+        if "sections" in outputs:
+            parsed["sections"] = self._sections_from_spans(spans)
+        if "skills" in outputs:
+            parsed["skills"] = self.extract_skills_from_spans(
+                spans, text, line_index=line_index)
+        if "experience" in outputs:
+            parsed["experience"] = self.experience_analyzer.extract_experience_from_sections(
+                self._span_texts(spans, "experience"))
+        if "projects" in outputs:
+            parsed["projects"] = self.project_analyzer.extract_projects_from_sections(
+                self._span_texts(spans, "projects"))
+        if "professional_summary" in outputs:
+            parsed["professional_summary"] = self.summary_analyzer.extract_professional_summary_from_sections(
+                self._span_texts(spans, "professional_summary"))
+
+        parsed["raw_text"] = text
+        return parsed
 
     def __del__(self):
         try:
@@ -0,0 +1,73 @@
+import codecs
+import io
+from typing import BinaryIO, Iterator, Union
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+SNIFF_BYTES = 64 * 1024
+# charset_normalizer guesses poorly on short samples, e.g. short cp1252 resumes come back as cp775
+MIN_DETECT_BYTES = 256
+FALLBACK_ENCODING = "cp1252"
+
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+LINE_SEPARATORS = str.maketrans({
+    '\u2028': '\n', '\u2029': '\n', '\x0b': '\n', '\x0c': '\n', '\x00': None
+})
+
+
+def detect_encoding(head: bytes) -> str:
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    if from_bytes is None or len(head) < MIN_DETECT_BYTES:
+        return FALLBACK_ENCODING
+
+    matches = from_bytes(head)
+    best = matches.best()
+    if best is None:
+        return FALLBACK_ENCODING
+
+    # Single-byte code pages often tie; prefer the Western one most resumes are saved in
+    for match in matches:
+        if match.chaos <= best.chaos and FALLBACK_ENCODING in match.could_be_from_charset:
+            return FALLBACK_ENCODING
+    return best.encoding
+
+
+def iter_text_lines(stream: BinaryIO) -> Iterator[str]:
+    head = stream.read(SNIFF_BYTES)
+    stream.seek(0)
+
+    reader = io.TextIOWrapper(
+        stream, encoding=detect_encoding(head), errors="replace", newline=None)
+    try:
+        for line in reader:
+            yield from line.translate(LINE_SEPARATORS).rstrip('\n').split('\n')
+    finally:
+        reader.detach()
+
+
+def extract_plain_text(source: Union[str, BinaryIO]) -> str:
+    if isinstance(source, str):
+        with open(source, "rb") as text_file:
+            return '\n'.join(line.rstrip() for line in iter_text_lines(text_file))
+
+    source.seek(0)
+    return '\n'.join(line.rstrip() for line in iter_text_lines(source))
@@ -0,0 +1,104 @@
+import hashlib
+import io
+import os
+import tempfile
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+
+from ..config import settings
+
+
+class UploadTooLargeError(ValueError):
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File too large. Max size: {max_size} bytes")
+        self.max_size = max_size
+
+
+class SpooledUpload:
+
+    def __init__(self, filename: str, suffix: str, spool_threshold: int):
+        self.filename = filename
+        self.suffix = suffix
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self.path: Optional[str] = None
+        self._file: BinaryIO = io.BytesIO()
+        self._hasher = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    def write(self, chunk: bytes):
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+        if self.path is None and self.size > self.spool_threshold:
+            self._rollover()
+        self._file.write(chunk)
+
+    def _rollover(self):
+        disk_file = tempfile.NamedTemporaryFile(
+            delete=False, suffix=self.suffix)
+        disk_file.write(self._file.getvalue())
+        self._file.close()
+        self._file = disk_file
+        self.path = disk_file.name
+
+    def stream(self) -> BinaryIO:
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def read_bytes(self) -> bytes:
+        return self.stream().read()
+
+    def close(self):
+        self._file.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def receive_upload(
+    upload: UploadFile,
+    max_size: Optional[int] = None,
+    spool_threshold: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> SpooledUpload:
+    max_size = max_size or settings.MAX_FILE_SIZE
+    spool_threshold = spool_threshold or settings.UPLOAD_SPOOL_THRESHOLD
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+
+    declared_size = getattr(upload, "size", None)
+    if declared_size is not None and declared_size > max_size:
+        raise UploadTooLargeError(max_size)
+
+    filename = upload.filename or ""
+    spooled = SpooledUpload(
+        filename, os.path.splitext(filename)[1].lower(), spool_threshold)
+
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            if spooled.size + len(chunk) > max_size:
+                raise UploadTooLargeError(max_size)
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+
+    return spooled
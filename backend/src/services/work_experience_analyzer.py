@@ -1,63 +1,38 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from .base_analyzer import BaseAnalyzer
-from sklearn.metrics.pairwise import cosine_similarity
+from .header_classifier import HeaderClassifier
+from .line_embedding_index import LineEmbeddingIndex
 
 
-class WorkExperienceAnalyzer(BaseAnalyzer):
+EXPERIENCE_HEADERS = [
+    "Work Experience", "Professional Experience", "Employment History",
+    "Career History", "Work History", "Experience", "Professional Background",
+    "Employment", "Career Experience", "Previous Positions", "Job Experience",
+    "Professional Roles", "Work Background", "Career Background", "Positions Held",
+    "Professional History", "Employment Record", "Work Record", "Job History",
+    "Professional Work Experience", "Career Progression"
+]
+
 
-    def __init__(self, sentence_model):
-        super().__init__(sentence_model)
-        self.experience_headers = [
-            "Work Experience", "Professional Experience", "Employment History",
-            "Career History", "Work History", "Experience", "Professional Background",
-            "Employment", "Career Experience", "Previous Positions", "Job Experience",
-            "Professional Roles", "Work Background", "Career Background", "Positions Held",
-            "Professional History", "Employment Record", "Work Record", "Job History",
-            "Professional Work Experience", "Career Progression"
-        ]
+class WorkExperienceAnalyzer(BaseAnalyzer):
 
-    def is_experience_header(self, line: str) -> bool:
-        return self._is_section_header(line, "experience", self.experience_headers)
+    def __init__(self, sentence_model, header_classifier: Optional[HeaderClassifier] = None):
+        super().__init__(sentence_model, header_classifier)
+        self.experience_headers = EXPERIENCE_HEADERS
+        self.header_classifier.register("experience", self.experience_headers)
 
-    def extract_experience_from_text(self, text: str) -> List[Dict[str, Any]]:
-        experience_sections = self._find_experience_sections(text)
+    def is_experience_header(self, line: str, line_index: Optional[LineEmbeddingIndex] = None) -> bool:
+        return self._is_section_header(line, "experience", self.experience_headers,
+                                       line_index=line_index)
 
+    def extract_experience_from_sections(self, section_texts: List[str]) -> List[Dict[str, Any]]:
         all_experiences = []
-        for section_text in experience_sections:
+        for section_text in section_texts:
             experiences = self._parse_experience_entries(section_text)
             all_experiences.extend(experiences)
 
         return all_experiences
 
-    def _find_experience_sections(self, text: str) -> List[str]:
-        lines = text.split('\n')
-        experience_sections = []
-        experience_embeddings = self._get_section_embeddings(
-            "experience", self.experience_headers)
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line:
-                i += 1
-                continue
-
-            line_embedding = self.sentence_model.encode([line])
-            similarities = cosine_similarity(
-                line_embedding, experience_embeddings)
-            max_similarity = similarities.max()
-
-            if max_similarity > 0.6:
-                section_content = self._extract_general_section_content(
-                    lines, i, [self.is_experience_header])
-                if section_content:
-                    experience_sections.append(section_content)
-                i += len(section_content.split('\n'))
-            else:
-                i += 1
-
-        return experience_sections
-
     def _parse_experience_entries(self, section_text: str) -> List[Dict[str, Any]]:
         if not section_text.strip():
             return []
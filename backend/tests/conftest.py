@@ -0,0 +1,26 @@
+import zlib
+
+import numpy as np
+import pytest
+
+
+class HashModel:
+    """Deterministic stand-in for a sentence-transformer: each text maps to CRCs of its first words."""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    def encode(self, texts, **kwargs):
+        rows = [[zlib.crc32(word.encode(), self.seed) % 13 + 1 for word in (text.lower().split() + [""] * 4)[:4]]
+                for text in texts]
+        return np.array(rows, dtype=np.float32)
+
+
+@pytest.fixture
+def make_hash_model():
+    return HashModel
+
+
+@pytest.fixture
+def hash_model(make_hash_model):
+    return make_hash_model()
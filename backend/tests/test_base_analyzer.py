@@ -0,0 +1,36 @@
+import pytest
+
+from src.services.base_analyzer import BaseAnalyzer
+from src.services.layout_features import HEADING
+from src.services.section_headers import LOOSE_HEADER_CONFIDENCE, SECTION_HEADERS
+
+
+@pytest.fixture
+def analyzer(hash_model):
+    analyzer = BaseAnalyzer(hash_model)
+    analyzer.header_classifier.register_many(SECTION_HEADERS)
+    return analyzer
+
+
+@pytest.mark.parametrize("line", ["Skills (Technical)", "Awards, Honors", "Top 3 Projects"])
+def test_structural_reject_keeps_real_headers(analyzer, line):
+    assert not analyzer._is_structural_non_header(line)
+
+
+@pytest.mark.parametrize("line", ["• Built APIs", "jane@example.com", "Jan 2019 - 2021",
+                                  "Led the team.", "Python, Java, Go, Rust"])
+def test_structural_reject_drops_body_lines(analyzer, line):
+    assert analyzer._is_structural_non_header(line)
+
+
+def test_loose_lexicon_entry_needs_header_styling(analyzer):
+    position = analyzer.header_classifier.label_positions["experience"]
+
+    stage, row = analyzer._resolve_header_stage("Work")
+    assert stage == "dictionary"
+    assert row[position] == pytest.approx(LOOSE_HEADER_CONFIDENCE)
+
+    for line, hint in (("WORK", None), ("Work:", None), ("Work", HEADING)):
+        assert analyzer._resolve_header_stage(line, hint)[1][position] == 1.0
+
+    assert analyzer._resolve_header_stage("Work Experience")[1][position] == 1.0
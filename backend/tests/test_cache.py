@@ -0,0 +1,42 @@
+import os
+
+from src.services.cache import DiskCache
+
+
+def _age(cache, key, seconds_ago):
+    path = cache._path(key)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds_ago, stat.st_mtime - seconds_ago))
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=25)
+    cache.put("old", "a" * 8)
+    cache.put("new", "b" * 8)
+    _age(cache, "old", 200)
+    _age(cache, "new", 100)
+
+    assert cache.get("old") == "a" * 8
+    cache.put("third", "c" * 8)
+
+    assert cache.get("old") == "a" * 8
+    assert cache.get("new") is None
+
+
+def test_disk_cache_hit_keeps_write_time_for_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl_seconds=50)
+    cache.put("key", "value")
+    _age(cache, "key", 100)
+
+    assert cache.get("key") is None
+    assert cache.expirations == 1
+
+
+def test_disk_cache_byte_cap_covers_other_processes(tmp_path):
+    first = DiskCache(str(tmp_path), max_bytes=25)
+    second = DiskCache(str(tmp_path), max_bytes=25)
+    first.put("a", "a" * 8)
+    second.put("b", "b" * 8)
+    first.put("c", "c" * 8)
+
+    assert sum(entry.stat().st_size for entry in os.scandir(tmp_path)) <= 25
@@ -0,0 +1,94 @@
+import io
+import zipfile
+
+import pytest
+from docx import Document
+
+from src.config import settings
+from src.services.doc_generator import document_generator
+from src.services.document_parser import DocumentParser
+from src.services.docx_extractor import docx_text_parts, extract_docx_text, extract_docx_text_with_layout
+from src.services.layout_features import HEADING
+
+
+def build_docx() -> bytes:
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    for text in ["Professional Summary", "Backend engineer", "Skills", "Python, Go"]:
+        doc.add_paragraph(text)
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Table cell"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def rename_main_part(data: bytes, new_name: str = "word/main.xml") -> bytes:
+    source = zipfile.ZipFile(io.BytesIO(data))
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            name = item.filename
+            if name == "word/document.xml":
+                name = new_name
+            elif name == "word/_rels/document.xml.rels":
+                name = f"word/_rels/{new_name.rsplit('/', 1)[1]}.rels"
+            elif name in ("_rels/.rels", "[Content_Types].xml"):
+                content = content.replace(b"word/document.xml", new_name.encode())
+            target.writestr(name, content)
+    return output.getvalue()
+
+
+def test_main_part_is_resolved_from_package_relationships():
+    data = rename_main_part(build_docx())
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert "word/main.xml" in docx_text_parts(archive)
+
+    assert extract_docx_text(io.BytesIO(data)) == extract_docx_text(io.BytesIO(build_docx()))
+    assert "Backend engineer" in extract_docx_text(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("extractor", ["stream", "python-docx"])
+def test_loaded_document_text_follows_configured_extractor(monkeypatch, extractor):
+    monkeypatch.setattr(settings, "DOCX_EXTRACTOR", extractor)
+    data = rename_main_part(build_docx())
+
+    text = document_generator.load_document(io.BytesIO(data)).text
+
+    if extractor == "stream":
+        assert text == extract_docx_text(io.BytesIO(data))
+    else:
+        assert text == "Professional Summary\nBackend engineer\nSkills\nPython, Go"
+
+
+def build_styled_docx() -> bytes:
+    doc = Document()
+    doc.add_heading("Experience", level=1)
+    doc.add_paragraph("Built payment APIs in Python")
+    doc.add_heading("Skills", level=1)
+    doc.add_paragraph("Python, Go")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_layout_extraction_reads_styles():
+    text, hints = extract_docx_text_with_layout(io.BytesIO(build_styled_docx()))
+
+    assert text.split("\n") == ["Experience", "Built payment APIs in Python", "Skills", "Python, Go"]
+    assert hints["Experience"] == HEADING
+    assert hints["Skills"] == HEADING
+
+
+def test_document_parser_stream_extractor_keeps_layout_text(monkeypatch):
+    monkeypatch.setattr(settings, "DOCX_EXTRACTOR", "stream")
+    monkeypatch.setattr(settings, "LAYOUT_HINTS_ENABLED", True)
+    parser = DocumentParser.__new__(DocumentParser)
+    monkeypatch.setattr(parser, "parse_text", lambda text, outputs, hints: {"raw_text": text, "hints": hints},
+                        raising=False)
+
+    parsed = parser._parse_document(io.BytesIO(build_styled_docx()), "docx")
+
+    assert "Built payment APIs in Python" in parsed["raw_text"]
+    assert parsed["hints"]["Skills"] == HEADING
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from src.config import settings
+from src.services import embedding_backend
+from src.services.embedding_backend import (MODEL_CACHE_FOLDER, load_sentence_model,
+                                            load_verified_sentence_model, verify_backend_accuracy)
+
+
+def _load_cached_model(backend: str):
+    model_name = settings.SENTENCE_TRANSFORMER_MODEL
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+    if not os.path.isdir(os.path.join(MODEL_CACHE_FOLDER, f"models--{model_name.replace('/', '--')}")):
+        pytest.skip(f"{model_name} is not in the local model cache")
+
+    try:
+        return load_sentence_model(backend)
+    except Exception as e:
+        pytest.skip(f"Could not load {backend} model: {e}")
+
+
+@pytest.mark.parametrize("backend", ["onnx", "onnx-int8"])
+def test_onnx_backend_classifies_like_torch(backend):
+    pytest.importorskip("onnxruntime")
+    reference = _load_cached_model("torch")
+    candidate = _load_cached_model(backend)
+
+    result = verify_backend_accuracy(candidate, reference)
+
+    assert result["mismatches"] == []
+
+
+@pytest.fixture
+def onnx_backend(monkeypatch, make_hash_model):
+    models = {"torch": make_hash_model()}
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND_VERIFY", True)
+    monkeypatch.setattr(embedding_backend, "_load_sentence_model", models.__getitem__)
+    return models
+
+
+def test_verified_backend_is_kept_when_classification_matches(onnx_backend, make_hash_model):
+    onnx_backend["onnx"] = make_hash_model()
+
+    assert load_verified_sentence_model() == (onnx_backend["onnx"], "onnx")
+
+
+def test_verification_falls_back_to_torch_on_any_mismatch(onnx_backend, make_hash_model):
+    onnx_backend["onnx"] = make_hash_model(seed=7)
+
+    assert verify_backend_accuracy(onnx_backend["onnx"], onnx_backend["torch"])["mismatches"]
+    assert load_verified_sentence_model() == (onnx_backend["torch"], "torch")
@@ -0,0 +1,47 @@
+import sqlite3
+
+import numpy as np
+
+from src.services import embedding_cache
+from src.services.embedding_cache import CachedSentenceEncoder, EmbeddingDiskStore
+
+
+def test_cached_rows_do_not_share_the_batch_array(hash_model):
+    encoder = CachedSentenceEncoder(hash_model, "hash", max_entries=10)
+    batch = encoder.encode(["Python", "Docker", "Kubernetes"])
+
+    cached = [encoder.memory.get(encoder._key(text)) for text in ["Python", "Docker", "Kubernetes"]]
+
+    assert all(vector.base is None for vector in cached)
+    np.testing.assert_array_equal(np.stack(cached), batch)
+    assert encoder.encode("Docker").tolist() == batch[1].tolist()
+
+
+def test_disk_store_prunes_least_recently_used_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "PRUNE_INTERVAL", 1)
+    store = EmbeddingDiskStore(str(tmp_path / "embeddings.sqlite3"), 0, max_entries=2)
+    vector = np.ones(3, dtype=np.float32)
+
+    store.put_many({"old": vector})
+    store.put_many({"recent": vector})
+    assert set(store.get_many(["old"])) == {"old"}
+    store.put_many({"new": vector})
+
+    assert set(store.get_many(["old", "recent", "new"])) == {"old", "new"}
+    assert store.evictions == 1
+    store.close()
+
+
+def test_disk_store_adds_last_used_to_existing_files(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    connection.executemany("INSERT INTO embeddings VALUES (?, ?)",
+                           [(key, np.ones(3, dtype=np.float32).tobytes()) for key in "abc"])
+    connection.commit()
+    connection.close()
+
+    store = EmbeddingDiskStore(path, 0, max_entries=2)
+
+    assert len(store.get_many(list("abc"))) == 2
+    store.close()
@@ -0,0 +1,142 @@
+import asyncio
+import io
+import os
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from docx import Document
+
+from src.config import settings
+from src.services import executors
+from src.services.doc_generator import LoadedDocument, document_generator
+from src.services.upload_stream import SpooledUpload
+
+
+class _Memory:
+    hits = 0
+    misses = 0
+
+
+class _Encoder:
+
+    def __init__(self):
+        self.memory = _Memory()
+        self.disk_hits = 0
+        self.encoded = 0
+
+
+class _Analyzer:
+
+    def __init__(self):
+        self.header_stage_counts = Counter()
+
+
+class WorkerParser:
+
+    def __init__(self):
+        self.sentence_transformer = _Encoder()
+        self.analyzer = _Analyzer()
+        self.stored = []
+
+    def get_cached_parse(self, content_hash, file_type, outputs=None):
+        return None
+
+    def store_parse(self, content_hash, file_type, parsed, outputs=None):
+        self.stored.append(content_hash)
+
+    def parse_document(self, source, file_type, content_hash=None, outputs=None):
+        if file_type == "crash":
+            os._exit(1)
+        self.analyzer.header_stage_counts.update({"dictionary": 2, "model": 1})
+        self.sentence_transformer.memory.misses += 3
+        self.sentence_transformer.encoded += 3
+        return {"raw_text": source.read().decode(), "pid": os.getpid(),
+                "pdf_mode": settings.PDF_EXTRACT_MODE}
+
+
+def make_upload(data: bytes, suffix: str) -> SpooledUpload:
+    upload = SpooledUpload(f"resume{suffix}", suffix, spool_threshold=1024 * 1024)
+    upload.write(data)
+    return upload
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    executors.shutdown_executor()
+    monkeypatch.setattr(settings, "CPU_EXECUTOR", "process")
+    monkeypatch.setattr(settings, "CPU_EXECUTOR_WORKERS", 1)
+    monkeypatch.setattr(executors, "worker_parser_factory", WorkerParser)
+    yield
+    executors.shutdown_executor()
+
+
+def test_thread_mode_is_the_default():
+    assert type(settings).model_fields["CPU_EXECUTOR"].default == "thread"
+
+
+def test_parse_runs_in_worker_and_reports_worker_counters(process_pool):
+    parser = WorkerParser()
+    before = executors.worker_stats()
+
+    with make_upload(b"Skills\nPython", ".txt") as upload:
+        parsed = asyncio.run(executors.parse_upload(parser, upload, "txt"))
+
+    assert parsed["raw_text"] == "Skills\nPython"
+    assert parsed["pid"] != os.getpid()
+    assert parsed["pdf_mode"] == "serial"
+    assert parser.stored == [upload.sha256]
+
+    after = executors.worker_stats()
+    stages = Counter(after["header_detection_stages"])
+    stages.subtract(before["header_detection_stages"])
+    assert stages["dictionary"] == 2 and stages["model"] == 1
+    embedding = Counter(after["embedding_cache"])
+    embedding.subtract(before["embedding_cache"])
+    assert embedding["encoded"] == 3
+
+
+def test_broken_pool_is_replaced(process_pool):
+    parser = WorkerParser()
+
+    with make_upload(b"boom", ".txt") as upload:
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(executors.parse_upload(parser, upload, "crash"))
+
+    with make_upload(b"Skills\nGo", ".txt") as upload:
+        parsed = asyncio.run(executors.parse_upload(parser, upload, "txt"))
+
+    assert parsed["raw_text"] == "Skills\nGo"
+
+
+def test_warm_up_starts_workers(process_pool):
+    asyncio.run(executors.warm_up_executor())
+
+    assert len(executors.get_cpu_executor()._processes) == settings.CPU_EXECUTOR_WORKERS
+
+
+def test_tailor_document_is_loaded_once_and_reused_in_process_mode(process_pool, tmp_path, monkeypatch):
+    doc = Document()
+    for text in ["Professional Summary", "Backend engineer", "Education", "BSc CS", "Projects", "Tool"]:
+        doc.add_paragraph(text)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    loads = []
+    load = document_generator.load_document
+    monkeypatch.setattr(document_generator, "load_document", lambda source: loads.append(source) or load(source))
+
+    output_path = tmp_path / "tailored.docx"
+    with make_upload(buffer.getvalue(), ".docx") as upload:
+        async def run():
+            document = await executors.load_document(document_generator, upload)
+            await executors.generate_tailored_resume(
+                document_generator, document, {}, {"skills": {}}, str(output_path))
+            return document
+
+        document = asyncio.run(run())
+
+    assert isinstance(document, LoadedDocument)
+    assert len(loads) == 1
+    assert "Backend engineer" in document.text
+    assert [p.text for p in Document(str(output_path)).paragraphs][2:4] == ["Education", "BSc CS"]
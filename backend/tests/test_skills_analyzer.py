@@ -0,0 +1,54 @@
+import uuid
+
+import chromadb
+import pytest
+from chromadb.api.client import SharedSystemClient
+
+from src.services.skills_analyzer import SKILL_PATTERNS, VectorSkillsAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def chroma_dir(tmp_path, monkeypatch):
+    # Chroma caches one client system per path, and every test uses the relative "chroma_db"
+    monkeypatch.chdir(tmp_path)
+    yield
+    SharedSystemClient.clear_system_cache()
+
+
+def test_compaction_keeps_other_models_entries(hash_model):
+    first = VectorSkillsAnalyzer(hash_model, "model-a")
+    second = VectorSkillsAnalyzer(hash_model, "model-b")
+    second_ids = {entry_id for entry_id, _, _ in second._taxonomy_entries()}
+    first.collection.add(ids=["legacy-a"], embeddings=hash_model.encode(["Old"]).tolist(),
+                         metadatas=[{"category": "devops", "skill": "Old", "model": "model-a"}])
+
+    assert first.compact_skill_database() == 1
+
+    stored_ids = set(first.collection.get(include=[])["ids"])
+    assert second_ids <= stored_ids
+    assert "legacy-a" not in stored_ids
+
+
+def test_seeding_removes_baseline_duplicates(hash_model):
+    client = chromadb.PersistentClient(path="chroma_db", settings=chromadb.config.Settings(
+        anonymized_telemetry=False, allow_reset=True, is_persistent=True))
+    collection = client.get_or_create_collection(name="Collection", metadata={"hnsw:space": "cosine"})
+    baseline = [(category, skill) for category, skills in SKILL_PATTERNS.items() for skill in skills] * 2
+    collection.add(ids=[str(uuid.uuid4()) for _ in baseline],
+                   embeddings=hash_model.encode([skill for _, skill in baseline]).tolist(),
+                   metadatas=[{"category": category, "skill": skill} for category, skill in baseline])
+
+    analyzer = VectorSkillsAnalyzer(hash_model, "model-a")
+
+    assert analyzer.collection.count() == len(analyzer._taxonomy_entries())
+
+
+def test_missing_taxonomy_embeddings_are_restored(hash_model):
+    analyzer = VectorSkillsAnalyzer(hash_model, "model-a")
+    entries = analyzer._taxonomy_entries()
+    analyzer.collection.delete(ids=[entry_id for entry_id, _, _ in entries[:3]])
+
+    analyzer._load_taxonomy_matrix()
+
+    assert analyzer.taxonomy_matrix.shape[0] == len(entries)
+    assert len(analyzer.collection.get(ids=[entry_id for entry_id, _, _ in entries], include=[])["ids"]) == len(entries)
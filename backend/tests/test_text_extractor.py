@@ -0,0 +1,32 @@
+import io
+
+import pytest
+
+from src.services.text_extractor import detect_encoding, extract_plain_text
+
+LATIN_RESUME = "Résumé\r\nSkills: Python, café management, naïve Bayes\r\nExperience at Société Générale – “lead”\r\n"
+
+
+@pytest.mark.parametrize("repeat", [1, 8])
+def test_cp1252_resume_decodes(repeat):
+    data = (LATIN_RESUME * repeat).encode("cp1252")
+
+    assert detect_encoding(data) == "cp1252"
+    assert extract_plain_text(io.BytesIO(data)).startswith("Résumé\nSkills: Python, café")
+
+
+def test_short_latin1_resume_decodes():
+    assert extract_plain_text(io.BytesIO(b"R\xe9sum\xe9\r\nSkills")) == "Résumé\nSkills"
+
+
+def test_utf8_is_preferred():
+    data = LATIN_RESUME.encode("utf-8")
+
+    assert detect_encoding(data) == "utf-8"
+    assert extract_plain_text(io.BytesIO(data)).startswith("Résumé")
+
+
+def test_long_cyrillic_resume_is_detected():
+    data = ("Опыт работы программистом. Навыки: Python, базы данных.\n" * 20).encode("cp1251")
+
+    assert "Опыт работы" in extract_plain_text(io.BytesIO(data))